@@ -10,8 +10,4 @@ def _prepare_logging():
     #logger.setLevel(logging.DEBUG)
     logger.addHandler(logging.NullHandler())
 
-    websocket_logger = logging.getLogger("websocket")
-    websocket_logger.setLevel(logging.DEBUG)
-    websocket_logger.addHandler(logging.NullHandler())
-
 _prepare_logging()
@@ -3,13 +3,20 @@ import time
 import json
 import logging
 import threading
-import requests
-import ssl
-import atexit
+import itertools
 from collections import deque
+from concurrent.futures import Future
 from quotexapi.ws.chanels.ssid import Ssid
-from quotexapi.ws.client import WebsocketClient
-import quotexapi.global_value as global_value
+from quotexapi.ws.chanels.buy import Buy
+from quotexapi.ws.chanels.candles import GetCandles
+from quotexapi.ws.chanels.instruments import GetInstruments
+from quotexapi.ws.chanels.subscribe import SubscribeCandles, UnsubscribeCandles
+from quotexapi.ws.chanels.subscribe import SubscribeMood, UnsubscribeMood, SubscribeSignals
+from quotexapi.ws.objects.coalescing import CoalescingChannel
+from quotexapi.state import SessionState
+from quotexapi.instruments import InstrumentCatalog
+from quotexapi.positions import PositionBook
+from quotexapi.latency import RttEstimator
 from collections import defaultdict
 
 
@@ -20,21 +27,46 @@ def nested_dict(n, type):
         return defaultdict(lambda: nested_dict(n-1, type))
 
 
-requests.packages.urllib3.disable_warnings()  # pylint: disable=no-member
-class Quotex(object):  # pylint: disable=too-many-instance-attributes
+class QuotexAPI(object):  # pylint: disable=too-many-instance-attributes
     """Class for communication with Quotex API."""
      
     # pylint: disable=too-many-public-methods
-    socket_option_opened={}
-    buy_id = None
-    def __init__(self, host, set_ssid):
+    def __init__(self, host, set_ssid, connect_timeout=30, auth_timeout=30, wss_url=None):
         """
         :param str host: The hostname or ip address of a Qoutex server.
         :param str set_ssid: The set_ssid of a Qoutex server.
+        :param float connect_timeout: Seconds to wait for the websocket to open.
+        :param float auth_timeout: Seconds to wait for the authorization reply.
+        :param str wss_url: Full websocket url, overrides ``host`` (e.g. the
+            url of :class:`MockQuotexServer <quotexapi.mock_server.MockQuotexServer>`).
         """
-        self.wss_url = "wss://ws.{host}/socket.io/?EIO=3&transport=websocket".format(host=host)
+        self.wss_url = wss_url or "wss://ws.{host}/socket.io/?EIO=3&transport=websocket".format(host=host)
         self.websocket_client = None
+        self.websocket_writer = None
         self.set_ssid = set_ssid
+        self.connect_timeout = connect_timeout
+        self.auth_timeout = auth_timeout
+        self.state = SessionState(set_ssid)
+        self.socket_option_opened = {}
+        # correlation id -> Future of every request waiting for its reply
+        self.request_futures = {}
+        self._request_ids = itertools.count(1)
+        self._request_lock = threading.Lock()
+        # CandleRingBuffer of every streamed active and size
+        self.real_time_candles = defaultdict(dict)
+        # CandleAggregator of every active streamed with size "all"
+        self.candle_aggregators = {}
+        # latest traders mood and trading signal of every active
+        self.mood_updates = CoalescingChannel()
+        self.signal_updates = CoalescingChannel()
+        # round trip time of the engine.io ping/pong heartbeat
+        self.rtt = RttEstimator()
+        # FrameRecorder of WebsocketClient.start_capture
+        self.frame_recorder = None
+        # open options, closed by the s_orders/close deals
+        self.positions = PositionBook()
+        # refreshed by the instruments/list reply
+        self.instruments = InstrumentCatalog()
 
 
     @property
@@ -47,22 +79,91 @@ class Quotex(object):  # pylint: disable=too-many-instance-attributes
 
     def send_websocket_request(self, data):
         """Send websocket request to Qoutex server.
+
+        The request is written by the writer thread, this method does not
+        wait for the socket.
+
         :param str data: The websocket request data.
+        :returns: The instance of :class:`SendHandle
+            <quotexapi.ws.writer.SendHandle>`.
         """
-        
-        logger = logging.getLogger(__name__)
+        return self.websocket_writer.send(data)
 
+    def new_request(self):
+        """Allocate a correlation id and the future resolved by its reply.
 
-         
-         
-        while (global_value.ssl_Mutual_exclusion or global_value.ssl_Mutual_exclusion_write) and no_force_send:
-            pass
-        global_value.ssl_Mutual_exclusion_write=True
-        self.websocket.send(data)
-        logger.debug(data)
-        global_value.ssl_Mutual_exclusion_write=False
+        :returns: Tuple of (correlation id, :class:`concurrent.futures.Future`).
+        """
+        future = Future()
+        with self._request_lock:
+            request_id = next(self._request_ids)
+            if self.state.closed_event.is_set():
+                # a closed session never answers, e.g. during a reconnect
+                future.set_exception(ConnectionError("Websocket connection closed."))
+            else:
+                self.request_futures[request_id] = future
+        return request_id, future
 
-    
+    def resolve_request(self, request_id, data):
+        """Resolve the future of a request with the server reply.
+
+        :returns: False if no request with this id is pending.
+        """
+        with self._request_lock:
+            future = self.request_futures.pop(request_id, None)
+        if future is None:
+            return False
+        future.resolved_at = time.perf_counter()
+        if not future.done():
+            future.set_result(data)
+        return True
+
+    def cancel_request(self, request_id):
+        """Forget a request, e.g. after the caller timed out."""
+        with self._request_lock:
+            future = self.request_futures.pop(request_id, None)
+        if future is not None:
+            future.cancel()
+
+    def fail_requests(self, reason):
+        """Fail every pending request, used when the websocket closes."""
+        with self._request_lock:
+            futures = list(self.request_futures.values())
+            self.request_futures.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(ConnectionError(reason))
+
+    def buy(self, price, active, direction, duration, is_demo=1):
+        """Send a buy request without waiting for the server.
+
+        :param price: The buying price.
+        :param str active: The buying active name.
+        :param str direction: The buying direction, "call" or "put".
+        :param int duration: The expiration time in seconds.
+        :returns: The :class:`concurrent.futures.Future` resolved with the
+            ``s_orders/open`` reply of this request, its ``handle`` is the
+            :class:`SendHandle <quotexapi.ws.writer.SendHandle>` of the request.
+        """
+        request_id, future = self.new_request()
+        future.request_id = request_id
+        future.handle = Buy(self)(price, active, direction, duration, request_id, is_demo)
+        return future
+
+    def get_candles(self, active, size, end_time, offset):
+        """Send a history request without waiting for the server.
+
+        :param str active: The active name.
+        :param int size: The candle size in seconds.
+        :param int end_time: Unix time of the last requested candle.
+        :param int offset: Seconds of history before ``end_time``.
+        :returns: The :class:`concurrent.futures.Future` resolved with the
+            ``s_history/load/line`` reply of this request.
+        """
+        index, future = self.new_request()
+        future.request_id = index
+        GetCandles(self)(active, size, end_time, offset, index)
+        return future
 
     @property
     def ssid(self):
@@ -72,45 +173,106 @@ class Quotex(object):  # pylint: disable=too-many-instance-attributes
         """
         return Ssid(self)
 
+    @property
+    def get_instruments(self):
+        """Property for get Qoutex websocket instruments list chanel.
+        :returns: The instance of :class:`GetInstruments
+            <Qoutex.ws.chanels.instruments.GetInstruments>`.
+        """
+        return GetInstruments(self)
+
+    @property
+    def subscribe_candles(self):
+        """Property for get Qoutex websocket candles subscribe chanel.
+        :returns: The instance of :class:`SubscribeCandles
+            <Qoutex.ws.chanels.subscribe.SubscribeCandles>`.
+        """
+        return SubscribeCandles(self)
+
+    @property
+    def unsubscribe_candles(self):
+        """Property for get Qoutex websocket candles unsubscribe chanel.
+        :returns: The instance of :class:`UnsubscribeCandles
+            <Qoutex.ws.chanels.subscribe.UnsubscribeCandles>`.
+        """
+        return UnsubscribeCandles(self)
+
+    @property
+    def subscribe_mood(self):
+        """Property for get Qoutex websocket mood subscribe chanel.
+        :returns: The instance of :class:`SubscribeMood
+            <Qoutex.ws.chanels.subscribe.SubscribeMood>`.
+        """
+        return SubscribeMood(self)
+
+    @property
+    def unsubscribe_mood(self):
+        """Property for get Qoutex websocket mood unsubscribe chanel.
+        :returns: The instance of :class:`UnsubscribeMood
+            <Qoutex.ws.chanels.subscribe.UnsubscribeMood>`.
+        """
+        return UnsubscribeMood(self)
+
+    @property
+    def subscribe_signals(self):
+        """Property for get Qoutex websocket signals subscribe chanel.
+        :returns: The instance of :class:`SubscribeSignals
+            <Qoutex.ws.chanels.subscribe.SubscribeSignals>`.
+        """
+        return SubscribeSignals(self)
+
     # -------------------------------------------------------
-    def start_websocket(self):
-        global_value.check_websocket_if_connect = None
-        global_value.check_websocket_if_error=False
-        global_value.websocket_error_reason=None
-         
+    def start_websocket(self, timeout=None):
+        """Open the websocket and wait until it is connected, closed or failed.
+
+        :param float timeout: Seconds to wait, defaults to ``connect_timeout``.
+        :returns: Tuple of (connected, reason).
+        """
+        self.state.reset()
+
+        # websocket-client and ssl are only loaded once a connection is opened
+        import ssl  # pylint: disable=import-outside-toplevel
+        from quotexapi.ws.client import WebsocketClient  # pylint: disable=import-outside-toplevel
+        from quotexapi.ws.writer import WebsocketWriter  # pylint: disable=import-outside-toplevel
         self.websocket_client = WebsocketClient(self)
+        self.websocket_writer = WebsocketWriter(self)
+        self.websocket_writer.start()
 
+        # ping_timeout is only the select() timeout of the reader here, the
+        # heartbeat is engine.io's; without it a close() from another thread
+        # can leave the reader blocked on the closed socket forever
         self.websocket_thread = threading.Thread(target=self.websocket.run_forever, kwargs={'sslopt': {
-                                                 "check_hostname": False, "cert_reqs": ssl.CERT_NONE, "ca_certs": "cacert.pem"}})  # for fix pyinstall error: cafile, capath and cadata cannot be all omitted
+                                                 "check_hostname": False, "cert_reqs": ssl.CERT_NONE, "ca_certs": "cacert.pem"},  # for fix pyinstall error: cafile, capath and cadata cannot be all omitted
+                                                 'ping_timeout': 1})
         self.websocket_thread.daemon = True
         self.websocket_thread.start()
-        while True:
-            try:
-                if global_value.check_websocket_if_error:
-                    return False,global_value.websocket_error_reason
-                if global_value.check_websocket_if_connect == 0 :
-                    return False,"Websocket connection closed."
-                elif global_value.check_websocket_if_connect == 1:
-                    return True,None
-            except:
-                pass
+        if timeout is None:
+            timeout = self.connect_timeout
+        if not self.state.websocket_event.wait(timeout):
+            return False,"Websocket connection timed out."
+        if self.state.check_websocket_if_error:
+            return False,self.state.websocket_error_reason
+        if self.state.check_websocket_if_connect == 1:
+            return True,None
+        return False,"Websocket connection closed."
 
-            pass
+    def send_ssid(self, timeout=None):
+        """Authorize the session and wait for the server reply.
 
-    def send_ssid(self):
-        self.profile.msg=None
-        self.ssid(global_value.SSID)  # pylint: disable=not-callable
-        while self.profile.msg==None:
-            pass
-        if self.profile.msg==False:
+        :param float timeout: Seconds to wait, defaults to ``auth_timeout``.
+        :returns: True if the ssid was accepted.
+        """
+        self.state.authorization_accepted = None
+        self.state.authorization_event.clear()
+        self.ssid(self.state.SSID)  # pylint: disable=not-callable
+        if timeout is None:
+            timeout = self.auth_timeout
+        if not self.state.authorization_event.wait(timeout):
+            logging.getLogger(__name__).error("Authorization timed out.")
             return False
-        else:
-            return True
+        return bool(self.state.authorization_accepted)
 
     def connect(self):
-        
-        global_value.ssl_Mutual_exclusion=False
-        global_value.ssl_Mutual_exclusion_write=False
         """Method for connection to Qoutex API."""
         try:
             self.close()
@@ -122,20 +284,25 @@ class Quotex(object):  # pylint: disable=too-many-instance-attributes
             return check_websocket,websocket_reason
         #the ssid is None need get ssid
         else:
-            response=self.get_ssid()  
-            try:
-               global_value.SSID = response
-            except:
+            if not self.send_ssid():
                 self.close()
-                return False
-            self.send_ssid()
+                return False,"Authorization failed."
         
     
         return True,None
 
     def close(self):
+        self.websocket_client.stop_heartbeat()
+        self.websocket_writer.stop()
         self.websocket.close()
-        self.websocket_thread.join()
+        self.websocket_thread.join(self.connect_timeout)
     
+    def get_rtt(self):
+        """Get the network round trip time measured by the heartbeat.
+
+        :returns: Dict with count, last_ms, min_ms, ewma_ms and p99_ms.
+        """
+        return self.rtt.to_dict()
+
     def websocket_alive(self):
         return self.websocket_thread.is_alive()
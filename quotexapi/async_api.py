@@ -0,0 +1,363 @@
+"""Module for the asyncio Quotex client."""
+import asyncio
+import itertools
+import logging
+from collections import OrderedDict, defaultdict
+
+from quotexapi.ws.chanels.buy import Buy
+from quotexapi.ws.chanels.candles import GetCandles
+from quotexapi.ws.chanels.ssid import Ssid
+from quotexapi.ws.chanels.subscribe import SubscribeCandles, UnsubscribeCandles
+from quotexapi.ws.objects.candles import candle_from_row
+from quotexapi.ws.parser import FrameParser, EVENT, OPEN, PING, PONG
+
+# put in the stream queues when the connection is lost
+_CLOSED = object()
+
+
+class AsyncQuotex(object):
+    """Class for communication with Quotex API from one asyncio event loop.
+
+    Every connection is a pair of tasks (reader and writer) on the running
+    loop, so many accounts and subscriptions can share a single thread. A
+    third task sends the engine.io pings. When the connection is lost every
+    pending call fails with ConnectionError and the streams end.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, set_ssid, host="quotex.market", is_demo=1,
+                 connect_timeout=30, auth_timeout=30, stream_queue_size=1000, wss_url=None,
+                 keep_closed=10000):
+        """
+        :param str set_ssid: The set_ssid of a Qoutex server.
+        :param str host: The hostname or ip address of a Qoutex server.
+        :param int is_demo: 1 for the practice account, 0 for the real one.
+        :param float connect_timeout: Seconds to wait for the websocket to open.
+        :param float auth_timeout: Seconds to wait for the authorization reply.
+        :param int stream_queue_size: Candles buffered per stream consumer.
+        :param str wss_url: Full websocket url, overrides ``host``.
+        :param int keep_closed: Results of closed options kept for a later
+            :meth:`check_win`.
+        """
+        self.wss_url = wss_url or "wss://ws.{host}/socket.io/?EIO=3&transport=websocket".format(host=host)
+        self.set_ssid = set_ssid
+        self.is_demo = is_demo
+        self.connect_timeout = connect_timeout
+        self.auth_timeout = auth_timeout
+        self.stream_queue_size = stream_queue_size
+        self.keep_closed = keep_closed
+        self.websocket = None
+        self._reader_task = None
+        self._writer_task = None
+        self._heartbeat_task = None
+        # loop time of the ping waiting for its pong
+        self._ping_sent = None
+        self._outbox = None
+        self._authorization = None
+        self._parser = None
+        self._handlers = {
+            "s_authorization": self._on_authorization,
+            "authorization/reject": self._on_authorization_reject,
+            "s_orders/open": self._on_order_open,
+            "s_orders/close": self._on_order_close,
+            "s_history/load/line": self._on_candles,
+            "candles/update": self._on_candle_update,
+        }
+        self._request_ids = itertools.count(1)
+        self._orders = {}
+        self._wins = {}
+        # profit of the closed options nobody waited for, oldest first
+        self._results = OrderedDict()
+        self._candles = {}
+        self._streams = defaultdict(set)
+
+    def send_websocket_request(self, data):
+        """Queue a websocket request for the writer task.
+
+        :param str data: The websocket request data.
+        """
+        self._outbox.put_nowait(data)
+
+    async def connect(self):
+        """Open the websocket and authorize the session.
+
+        :returns: Tuple of (connected, reason).
+        """
+        try:
+            import websockets  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            return False, "AsyncQuotex needs the websockets package."
+        await self.close()
+        self._ping_sent = None
+        context = None
+        if self.wss_url.startswith("wss://"):
+            import ssl  # pylint: disable=import-outside-toplevel
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        try:
+            self.websocket = await asyncio.wait_for(
+                websockets.connect(self.wss_url, ssl=context, max_size=None),
+                self.connect_timeout)
+        except asyncio.TimeoutError:
+            return False, "Websocket connection timed out."
+        except Exception as error:  # pylint: disable=broad-except
+            return False, str(error)
+        loop = asyncio.get_running_loop()
+        self._outbox = asyncio.Queue()
+        self._parser = FrameParser()
+        self._authorization = loop.create_future()
+        self._reader_task = loop.create_task(self._reader())
+        self._writer_task = loop.create_task(self._writer())
+        Ssid(self)(self.set_ssid, self.is_demo)
+        try:
+            accepted = await asyncio.wait_for(asyncio.shield(self._authorization),
+                                              self.auth_timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            return False, "Authorization timed out."
+        if not accepted:
+            await self.close()
+            return False, "Authorization failed."
+        for active, size in self._streams:
+            SubscribeCandles(self)(active, size)
+        return True, None
+
+    async def close(self):
+        """Close the websocket and stop the reader, writer and heartbeat tasks."""
+        tasks = [task for task in (self._heartbeat_task, self._writer_task, self._reader_task)
+                 if task is not None and task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        if self.websocket is not None:
+            await self.websocket.close()
+        # the reader fails the pending calls on its way out, before a new
+        # connection registers its own
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.websocket = None
+        self._reader_task = None
+        self._writer_task = None
+        self._heartbeat_task = None
+
+    @property
+    def connected(self):
+        """Property to check if the reader of the connection is running."""
+        return self._reader_task is not None and not self._reader_task.done()
+
+    # _____________________BUY________________________________
+
+    async def buy(self, ACTIVES, price, ACTION, expirations, timeout=30):
+        """Buy a binary option and wait for the server ack.
+
+        :param str ACTIVES: The active name.
+        :param price: The buying price.
+        :param str ACTION: "call" or "put".
+        :param int expirations: The expiration time in seconds.
+        :returns: Tuple of (success, order id or reason).
+        """
+        if not self.connected:
+            return False, "Websocket connection closed."
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._orders[request_id] = future
+        Buy(self)(price, ACTIVES, ACTION.lower(), expirations, request_id, self.is_demo)
+        try:
+            message = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False, "buy timed out"
+        except ConnectionError as error:
+            return False, str(error)
+        finally:
+            self._orders.pop(request_id, None)
+        if "error" in message:
+            return False, message["error"]
+        return True, message["id"]
+
+    async def check_win(self, id_number, timeout=None):
+        """Wait for the result of an option.
+
+        :param id_number: The order id returned by :meth:`buy`.
+        :returns: The profit of the closed option, raise ConnectionError
+            when the connection is lost first.
+        """
+        if id_number in self._results:
+            return self._results.pop(id_number)
+        future = self._wins.get(id_number)
+        if future is None:
+            if not self.connected:
+                raise ConnectionError("Websocket connection closed.")
+            future = asyncio.get_running_loop().create_future()
+            self._wins[id_number] = future
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            if future.done():
+                self._wins.pop(id_number, None)
+
+    # ________________________________________________________________________
+    # _______________________        CANDLE      _____________________________
+
+    async def get_candles(self, ACTIVES, interval, offset, period, timeout=30):
+        """Load historical candles.
+
+        :param str ACTIVES: The active name.
+        :param int interval: The candle size in seconds.
+        :param int offset: Unix time of the last requested candle.
+        :param int period: Seconds of history before ``offset``.
+        :returns: List of candle dicts ordered by time, raise TimeoutError
+            or ConnectionError.
+        """
+        if not self.connected:
+            raise ConnectionError("Websocket connection closed.")
+        index = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._candles[index] = future
+        GetCandles(self)(ACTIVES, interval, offset, period, index)
+        try:
+            message = await asyncio.wait_for(future, timeout)
+        finally:
+            self._candles.pop(index, None)
+        return [candle_from_row(row) for row in message.get("candles", [])]
+
+    async def candles_stream(self, ACTIVE, size):
+        """Async iterator over realtime candles of one (active, size).
+
+        The subscription is sent on first use and dropped when the last
+        consumer of the stream stops iterating. Raise ConnectionError when
+        the connection is lost.
+        """
+        queue = asyncio.Queue(self.stream_queue_size)
+        key = (ACTIVE, size)
+        if not self._streams[key]:
+            SubscribeCandles(self)(ACTIVE, size)
+        self._streams[key].add(queue)
+        try:
+            while True:
+                candle = await queue.get()
+                if candle is _CLOSED:
+                    raise ConnectionError("Websocket connection closed.")
+                yield candle
+        finally:
+            self._streams[key].discard(queue)
+            if not self._streams[key]:
+                del self._streams[key]
+                if self.connected:
+                    UnsubscribeCandles(self)(ACTIVE, size)
+
+    # ________________________________________________________________________
+
+    async def _writer(self):
+        websocket = self.websocket
+        while True:
+            data = await self._outbox.get()
+            try:
+                await websocket.send(data)
+            except Exception as error:  # pylint: disable=broad-except
+                # closing ends the reader, which fails the pending calls
+                logging.getLogger(__name__).error("can not send to the websocket: %s", error)
+                await websocket.close()
+                return
+            logging.getLogger(__name__).debug(data)
+
+    async def _heartbeat(self, interval, timeout):
+        loop = asyncio.get_running_loop()
+        websocket = self.websocket
+        while True:
+            await asyncio.sleep(interval)
+            if self._ping_sent is not None and loop.time() - self._ping_sent > interval + timeout:
+                logging.getLogger(__name__).error(
+                    "no pong for %.1fs, closing the websocket", loop.time() - self._ping_sent)
+                await websocket.close()
+                return
+            if self._ping_sent is None:
+                self._ping_sent = loop.time()
+                self.send_websocket_request(PING)
+
+    async def _reader(self):
+        logger = logging.getLogger(__name__)
+        heartbeat = None
+        try:
+            async for message in self.websocket:
+                try:
+                    packet = self._parser.parse(message)
+                except (ValueError, IndexError):
+                    logger.error("can not parse websocket message %r", message[:200])
+                    continue
+                if packet is None:
+                    continue
+                if packet[0] == OPEN:
+                    if heartbeat is not None:
+                        heartbeat.cancel()
+                    heartbeat = self._heartbeat_task = asyncio.get_running_loop().create_task(
+                        self._heartbeat(packet[2].get("pingInterval", 25000) / 1000.0,
+                                        packet[2].get("pingTimeout", 5000) / 1000.0))
+                    continue
+                if packet[0] == PING:
+                    self.send_websocket_request(PONG)
+                    continue
+                if packet[0] == PONG:
+                    self._ping_sent = None
+                    continue
+                if packet[0] != EVENT:
+                    continue
+                handler = self._handlers.get(packet[1])
+                if handler is None:
+                    continue
+                try:
+                    handler(packet[2])
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("error in handler of %s", packet[1])
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("websocket closed: %s", error)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+            if self._authorization is not None and not self._authorization.done():
+                self._authorization.set_result(False)
+            self._fail_pending("Websocket connection closed.")
+
+    def _fail_pending(self, reason):
+        for futures in (self._orders, self._candles, self._wins):
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(reason))
+            futures.clear()
+        for queues in self._streams.values():
+            for queue in queues:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(_CLOSED)
+
+    def _on_authorization(self, data):  # pylint: disable=unused-argument
+        if not self._authorization.done():
+            self._authorization.set_result(True)
+
+    def _on_authorization_reject(self, data):  # pylint: disable=unused-argument
+        if not self._authorization.done():
+            self._authorization.set_result(False)
+
+    def _on_order_open(self, data):
+        future = self._orders.get(data.get("requestId"))
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def _on_order_close(self, data):
+        for deal in data.get("deals", []):
+            future = self._wins.get(deal["id"])
+            if future is not None and not future.done():
+                future.set_result(deal["profit"])
+            else:
+                self._results[deal["id"]] = deal["profit"]
+                while len(self._results) > self.keep_closed:
+                    self._results.popitem(last=False)
+
+    def _on_candles(self, data):
+        future = self._candles.get(data.get("index"))
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def _on_candle_update(self, data):
+        for queue in self._streams.get((data["asset"], data["period"]), ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(data)
@@ -0,0 +1,124 @@
+"""Module for vectorized backtests of binary option strategies.
+
+A strategy is a function of the candle columns returning one signal per
+candle: 1 buys a call at the close of that candle, -1 a put, 0 nothing::
+
+    def momentum(columns):
+        return numpy.sign(columns["close"] - columns["open"])
+
+    report = backtest({"EURUSD": candles}, momentum, expirations=[60, 300])
+
+Every signal is one trade of stake 1, trades may overlap. The option is
+settled with the close of the candle ``expiration`` seconds later; when
+that candle is missing (market closed, gap in the data) the trade is
+skipped. Everything runs on whole NumPy arrays, the only Python loop is
+over the actives.
+"""
+from quotexapi.ws.objects.candles import FIELDS
+
+
+def candle_columns(candles):
+    """Convert candles to a dict of float64 NumPy columns ordered by time.
+
+    :param candles: List of candle dicts (:meth:`Quotex.get_candles
+        <quotexapi.stable_api.Quotex.get_candles>`), the ``{from: candle
+        dict}`` shape of :meth:`Quotex.get_realtime_candles
+        <quotexapi.stable_api.Quotex.get_realtime_candles>`, an ``(n, 6)``
+        array of :meth:`CandleRingBuffer.as_array
+        <quotexapi.ws.objects.candles.CandleRingBuffer.as_array>` or the
+        structured array of its ``snapshot``.
+    :returns: Dict of field name of :data:`FIELDS` to ``numpy.ndarray``.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    if isinstance(candles, dict) and "time" not in candles:
+        candles = sorted(candles.values(), key=lambda candle: candle.get("from", 0))
+    if isinstance(candles, dict):
+        columns = {field: numpy.asarray(candles[field], dtype=numpy.float64) for field in FIELDS}
+    elif isinstance(candles, numpy.ndarray) and candles.dtype.names:
+        columns = {field: numpy.asarray(candles[field], dtype=numpy.float64) for field in FIELDS}
+    elif isinstance(candles, numpy.ndarray):
+        columns = {field: candles[:, index].astype(numpy.float64)
+                   for index, field in enumerate(FIELDS)}
+    else:
+        keys = ("from", "open", "max", "min", "close", "volume")
+        columns = {field: numpy.fromiter((candle.get(key, 0) for candle in candles),
+                                         dtype=numpy.float64, count=len(candles))
+                   for field, key in zip(FIELDS, keys)}
+    order = numpy.argsort(columns["time"], kind="stable")
+    if (order != numpy.arange(len(order))).any():
+        columns = {field: column[order] for field, column in columns.items()}
+    return columns
+
+
+def evaluate(columns, signals, expirations, payout=0.8):
+    """Evaluate the signals of one active for every expiration at once.
+
+    :param dict columns: The columns of :func:`candle_columns`.
+    :param signals: Array of 1 (call), -1 (put) or 0 per candle.
+    :param expirations: Expirations in seconds.
+    :param float payout: Profit ratio of a won option, e.g. 0.8.
+    :returns: Dict of expiration to its stats, see :func:`backtest`.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    times = columns["time"]
+    close = columns["close"]
+    signals = numpy.sign(numpy.asarray(signals, dtype=numpy.float64))
+    if signals.shape != times.shape:
+        raise ValueError("the strategy must return one signal per candle")
+    expirations = numpy.asarray(expirations, dtype=numpy.float64)
+    if not len(times):
+        return {int(expiration): {"trades": 0, "wins": 0, "losses": 0, "ties": 0,
+                                  "win_rate": None, "return": 0.0,
+                                  "return_per_trade": None, "max_drawdown": 0.0}
+                for expiration in expirations}
+    # (candles, expirations) matrices: index of the candle settling each trade
+    targets = times[:, None] + expirations[None, :]
+    settle = numpy.searchsorted(times, targets)
+    found = settle < len(times)
+    settle = numpy.where(found, settle, 0)
+    found &= times[settle] == targets
+    traded = found & (signals[:, None] != 0)
+    move = numpy.sign(close[settle] - close[:, None]) * signals[:, None]
+    profit = numpy.where(traded, numpy.where(move > 0, payout, numpy.where(move < 0, -1.0, 0.0)), 0.0)
+    wins = (traded & (move > 0)).sum(axis=0)
+    losses = (traded & (move < 0)).sum(axis=0)
+    trades = traded.sum(axis=0)
+    # equity after every candle, trades booked at entry
+    equity = numpy.cumsum(profit, axis=0)
+    peak = numpy.maximum(numpy.maximum.accumulate(equity, axis=0), 0.0)
+    drawdown = (peak - equity).max(axis=0)
+    report = {}
+    for column, expiration in enumerate(expirations):
+        count = int(trades[column])
+        total = float(equity[-1, column])
+        report[int(expiration)] = {
+            "trades": count,
+            "wins": int(wins[column]),
+            "losses": int(losses[column]),
+            "ties": count - int(wins[column]) - int(losses[column]),
+            "win_rate": int(wins[column]) / count if count else None,
+            "return": total,
+            "return_per_trade": total / count if count else None,
+            "max_drawdown": float(drawdown[column]),
+        }
+    return report
+
+
+def backtest(candles_by_active, strategy, expirations, payout=0.8):
+    """Backtest a strategy on several actives and expirations.
+
+    :param dict candles_by_active: Active name to candles accepted by
+        :func:`candle_columns`.
+    :param strategy: Function of the columns returning the signals.
+    :param expirations: Expirations in seconds.
+    :param payout: Profit ratio of a won option, or dict of active to ratio.
+    :returns: Dict of {active: {expiration: stats}}; the stats are trades,
+        wins, losses, ties, win_rate, return and return_per_trade in stakes
+        and max_drawdown in stakes.
+    """
+    report = {}
+    for active, candles in candles_by_active.items():
+        columns = candle_columns(candles)
+        ratio = payout.get(active, 0.8) if isinstance(payout, dict) else payout
+        report[active] = evaluate(columns, strategy(columns), expirations, ratio)
+    return report
@@ -0,0 +1,261 @@
+"""Module for offline throughput and latency benchmarks of the Quotex client.
+
+Runs :class:`MockQuotexServer <quotexapi.mock_server.MockQuotexServer>` in
+a child process, so the CPU time measured here belongs to the client only::
+
+    python -m quotexapi.benchmark --messages 100000 --orders 1000
+
+``--import-only --max-import-ms 150`` only measures ``import
+quotexapi.stable_api`` in fresh interpreters and exits with status 1 when
+it is over budget or loads a module of :data:`HEAVY_MODULES`.
+"""
+import argparse
+import json
+import multiprocessing
+import subprocess
+import sys
+import threading
+import time
+
+from quotexapi.mock_server import MockQuotexServer
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """Return the nearest-rank percentiles and the max of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    result = {"p%d" % point: ordered[min(len(ordered) - 1, int(len(ordered) * point / 100.0))]
+              for point in points}
+    result["max"] = ordered[-1]
+    return result
+
+
+# modules that must only be imported once a connection is opened
+HEAVY_MODULES = ("requests", "urllib3", "websocket", "ssl", "simplejson", "orjson", "numpy")
+
+_IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import %s
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [name for name in %r if name in sys.modules]]))
+"""
+
+
+def bench_import(module="quotexapi.stable_api", repeat=5):
+    """Measure the import time of ``module`` in fresh interpreters.
+
+    :returns: Dict with the best and median import time in milliseconds and
+        the :data:`HEAVY_MODULES` the import loaded.
+    """
+    timings = []
+    heavy = set()
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _IMPORT_SCRIPT % (module, HEAVY_MODULES)])
+        elapsed, loaded = json.loads(output.decode().strip().splitlines()[-1])
+        timings.append(elapsed * 1000)
+        heavy.update(loaded)
+    timings.sort()
+    return {"best_ms": timings[0], "median_ms": timings[len(timings) // 2],
+            "heavy_modules": sorted(heavy)}
+
+
+def _serve(conn, options):
+    server = MockQuotexServer(**options)
+    conn.send(server.start())
+    while True:
+        command = conn.recv()
+        if command is None:
+            break
+        name, args = command
+        server.run(getattr(server, name)(*args))
+        conn.send(True)
+    server.stop()
+
+
+class MockServerProcess(object):
+    """Class for a :class:`MockQuotexServer` running in a child process."""
+
+    def __init__(self, **options):
+        self._conn, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, options))
+        self._process.daemon = True
+        self.url = None
+
+    def __enter__(self):
+        self._process.start()
+        self.url = self._conn.recv()
+        return self
+
+    def __exit__(self, *args):
+        self._conn.send(None)
+        self._process.join(5)
+
+    def push(self, name, *args):
+        """Run ``push_candles`` or ``push_ticks`` in the server and wait for it."""
+        self._conn.send((name, args))
+        self._conn.recv()
+
+
+def _connect(url):
+    from quotexapi.api import QuotexAPI  # pylint: disable=import-outside-toplevel
+    api = QuotexAPI("localhost", "benchmark", wss_url=url)
+    check, reason = api.connect()
+    if not check:
+        raise RuntimeError("can not connect to the mock server: %s" % reason)
+    return api
+
+
+def bench_parser(count=100000):
+    """Feed prebuilt frames straight into ``WebsocketClient.on_message``.
+
+    :returns: Dict with msgs_per_sec and cpu_us_per_msg of parse and routing.
+    """
+    from quotexapi.api import QuotexAPI  # pylint: disable=import-outside-toplevel
+    from quotexapi.ws.client import WebsocketClient  # pylint: disable=import-outside-toplevel
+    from quotexapi.ws.objects.candles import CandleRingBuffer  # pylint: disable=import-outside-toplevel
+    api = QuotexAPI("localhost", "benchmark")
+    client = WebsocketClient(api)
+    api.real_time_candles["EURUSD"][60] = CandleRingBuffer(1000)
+    frames = []
+    for number in range(1000):
+        candle = {"asset": "EURUSD", "period": 60, "from": 60 * number, "open": 1.0,
+                  "close": 1.1, "min": 0.9, "max": 1.2, "volume": 1}
+        frames.append("42" + json.dumps(["candles/update", candle]))
+    started, cpu = time.perf_counter(), time.process_time()
+    for number in range(count):
+        client.on_message(None, frames[number % 1000])
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+    return {"messages": count, "msgs_per_sec": count / elapsed,
+            "cpu_us_per_msg": cpu / count * 1e6}
+
+
+def bench_replay(path, speed=None):
+    """Replay a frame log recorded with ``WebsocketClient.start_capture``.
+
+    Every streamed candle gets a ring buffer, so the run covers the parser
+    and the candle store.
+
+    :returns: Dict with frames, msgs_per_sec and cpu_us_per_msg.
+    """
+    from quotexapi.api import QuotexAPI  # pylint: disable=import-outside-toplevel
+    from quotexapi.ws.client import WebsocketClient  # pylint: disable=import-outside-toplevel
+    from quotexapi.ws.objects.candles import CandleRingBuffer  # pylint: disable=import-outside-toplevel
+    from quotexapi.ws.recorder import FrameReplayer  # pylint: disable=import-outside-toplevel
+    api = QuotexAPI("localhost", "benchmark")
+    client = WebsocketClient(api)
+    handler = client.handlers["candles/update"]
+
+    def buffering(data):
+        if data["period"] not in api.real_time_candles[data["asset"]]:
+            api.real_time_candles[data["asset"]][data["period"]] = CandleRingBuffer(1000)
+        handler(data)
+
+    client.register("candles/update", buffering)
+    with FrameReplayer(path) as replayer:
+        cpu = time.process_time()
+        result = replayer.replay(client, speed)
+        cpu = time.process_time() - cpu
+    return {"frames": result["frames"], "msgs_per_sec": result["frames_per_sec"],
+            "cpu_us_per_msg": cpu / max(result["frames"], 1) * 1e6}
+
+
+def bench_inbound(server, count=100000):
+    """Measure candle frames per second received over a local websocket.
+
+    :param server: A started :class:`MockServerProcess`.
+    :returns: Dict with msgs_per_sec and cpu_us_per_msg of the client process.
+    """
+    from quotexapi.ws.objects.candles import CandleRingBuffer  # pylint: disable=import-outside-toplevel
+    api = _connect(server.url)
+    api.real_time_candles["EURUSD"][60] = CandleRingBuffer(1000)
+    done = threading.Event()
+    received = [0]
+    handler = api.websocket_client.handlers["candles/update"]
+
+    def counting(data):
+        handler(data)
+        received[0] += 1
+        if received[0] >= count:
+            done.set()
+
+    api.websocket_client.register("candles/update", counting)
+    try:
+        started, cpu = time.perf_counter(), time.process_time()
+        server.push("push_candles", "EURUSD", 60, count)
+        done.wait(300)
+        elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+    finally:
+        api.close()
+    return {"messages": received[0], "msgs_per_sec": received[0] / elapsed,
+            "cpu_us_per_msg": cpu / max(received[0], 1) * 1e6}
+
+
+def bench_orders(server, count=1000, pipelined=False):
+    """Measure order round trips from ``QuotexAPI.buy`` to the ``s_orders/open`` ack.
+
+    :param bool pipelined: Send every order before waiting for the acks.
+    :returns: Dict of latency percentiles in milliseconds and orders per second.
+    """
+    api = _connect(server.url)
+    latencies = []
+    try:
+        started = time.perf_counter()
+        if pipelined:
+            sent = []
+            for _ in range(count):
+                sent_at = time.perf_counter()
+                sent.append((sent_at, api.buy(1, "EURUSD", "call", 3600)))
+            for sent_at, future in sent:
+                future.result(30)
+                # stamped by resolve_request before set_result wakes us
+                latencies.append(future.resolved_at - sent_at)
+        else:
+            for _ in range(count):
+                sent_at = time.perf_counter()
+                api.buy(1, "EURUSD", "call", 3600).result(30)
+                latencies.append(time.perf_counter() - sent_at)
+        elapsed = time.perf_counter() - started
+    finally:
+        api.close()
+    result = {key: value * 1000 for key, value in percentiles(latencies).items()}
+    result["orders_per_sec"] = count / elapsed
+    return result
+
+
+def main(argv=None):
+    """Run the benchmark suite and print one line per benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--order-delay", type=float, default=0.0)
+    parser.add_argument("--import-only", action="store_true")
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--replay", metavar="LOG", help="also replay a recorded frame log")
+    args = parser.parse_args(argv)
+    report = {"import": bench_import()}
+    if args.replay:
+        report["replay"] = bench_replay(args.replay)
+    if not args.import_only:
+        report["parser"] = bench_parser(args.messages)
+        with MockServerProcess(order_delay=args.order_delay) as server:
+            report["inbound"] = bench_inbound(server, args.messages)
+            report["orders"] = bench_orders(server, args.orders)
+            report["orders_pipelined"] = bench_orders(server, args.orders, pipelined=True)
+    for name, values in report.items():
+        print("%-18s %s" % (name, "  ".join(
+            ("%s=%.2f" if isinstance(value, float) else "%s=%s") % (key, value)
+            for key, value in values.items())))
+    imported = report["import"]
+    if imported["heavy_modules"]:
+        parser.exit(1, "import loads %s\n" % ", ".join(imported["heavy_modules"]))
+    if args.max_import_ms is not None and imported["best_ms"] > args.max_import_ms:
+        parser.exit(1, "import takes %.1f ms, budget %.1f ms\n"
+                    % (imported["best_ms"], args.max_import_ms))
+    return report
+
+
+if __name__ == "__main__":
+    main()
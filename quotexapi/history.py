@@ -0,0 +1,122 @@
+"""Module for chunked, cached loading of historical Quotex candles."""
+import os
+import struct
+import tempfile
+import time
+from array import array
+
+from quotexapi.ws.objects.candles import FIELDS
+
+_MAGIC = b"QXC1"
+_HEADER = struct.Struct("<4sI")
+
+
+def default_cache_dir():
+    """Return the candle cache directory, ``$QUOTEX_CACHE_DIR`` or ``~/.cache/quotexapi``."""
+    return os.environ.get("QUOTEX_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "quotexapi", "candles")
+
+
+def split_range(interval, start, end, chunk_candles):
+    """Split ``[start, end]`` into chunks aligned on a fixed grid.
+
+    Aligning on multiples of ``interval * chunk_candles`` makes overlapping
+    requests share chunk keys, so they hit the same cache files.
+
+    :returns: List of (chunk start, chunk end) with inclusive candle times.
+    """
+    span = interval * chunk_candles
+    first = int(start) // span
+    last = int(end) // span
+    return [(number * span, (number + 1) * span - interval) for number in range(first, last + 1)]
+
+
+class CandleCache(object):
+    """Class for the on-disk columnar candle cache.
+
+    Every chunk of one (active, interval, time range) is one file holding
+    the column arrays time, open, high, low, close and volume back to back.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param str path: The cache directory, see :func:`default_cache_dir`.
+        """
+        self.path = path or default_cache_dir()
+
+    def chunk_path(self, active, interval, start, end):
+        """Return the file of one chunk."""
+        return os.path.join(self.path, active, str(interval), "%d-%d.qxc" % (start, end))
+
+    def load(self, active, interval, start, end):
+        """Load one chunk.
+
+        :returns: Dict of column name to ``array('d')`` or None if missing.
+        """
+        try:
+            with open(self.chunk_path(active, interval, start, end), "rb") as handle:
+                data = handle.read()
+        except OSError:
+            return None
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or len(data) != _HEADER.size + 8 * count * len(FIELDS):
+            return None
+        columns = {}
+        offset = _HEADER.size
+        for field in FIELDS:
+            column = array("d")
+            column.frombytes(data[offset:offset + 8 * count])
+            columns[field] = column
+            offset += 8 * count
+        return columns
+
+    def store(self, active, interval, start, end, columns):
+        """Write one chunk atomically."""
+        path = self.chunk_path(active, interval, start, end)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        count = len(columns["time"])
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as output:
+                output.write(_HEADER.pack(_MAGIC, count))
+                for field in FIELDS:
+                    array("d", columns[field]).tofile(output)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def columns_from_candles(candles):
+    """Convert candle dicts to the cache column arrays."""
+    return {
+        "time": array("d", (candle["from"] for candle in candles)),
+        "open": array("d", (candle["open"] for candle in candles)),
+        "high": array("d", (candle["max"] for candle in candles)),
+        "low": array("d", (candle["min"] for candle in candles)),
+        "close": array("d", (candle["close"] for candle in candles)),
+        "volume": array("d", (candle.get("volume", 0) for candle in candles)),
+    }
+
+
+def candles_from_columns(columns):
+    """Convert cache column arrays to candle dicts."""
+    return [{"from": int(columns["time"][index]), "open": columns["open"][index],
+             "close": columns["close"][index], "min": columns["low"][index],
+             "max": columns["high"][index], "volume": columns["volume"][index]}
+            for index in range(len(columns["time"]))]
+
+
+def is_closed(end, interval, now=None):
+    """Return True when the last candle of a chunk can no longer change."""
+    return end + interval <= (now if now is not None else time.time())
+
+
+def is_complete(candles, start, end, interval):
+    """Return True when the candles cover every candle time of ``[start, end]``.
+
+    An empty or truncated reply must not be cached as the final answer.
+    """
+    times = {candle["from"] for candle in candles if start <= candle["from"] <= end}
+    return len(times) == (end - start) // interval + 1
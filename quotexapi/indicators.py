@@ -0,0 +1,310 @@
+"""Module for incremental technical indicators on streaming candles.
+
+Every indicator keeps the state of the closed candles plus the candle that
+is still forming. A new timestamp closes the forming candle, updates of
+the same timestamp only replace it, so each update is O(1) and ``value``
+always includes the latest tick.
+"""
+import math
+import threading
+from collections import deque
+
+
+class Indicator(object):
+    """Class for the base of an incremental indicator."""
+
+    def __init__(self):
+        self._time = None
+        self._forming = None
+        self.value = None
+
+    def update(self, timestamp, open, high, low, close, volume=0.0):  # pylint: disable=redefined-builtin,unused-argument
+        """Feed a candle update.
+
+        :returns: The current value of the indicator, None while warming up.
+        """
+        if self._time is not None and timestamp < self._time:
+            return self.value
+        if self._time is not None and timestamp != self._time:
+            self._commit(*self._forming)
+        self._time = timestamp
+        self._forming = (high, low, close)
+        self.value = self._current(high, low, close)
+        return self.value
+
+    def _commit(self, high, low, close):
+        raise NotImplementedError
+
+    def _current(self, high, low, close):
+        raise NotImplementedError
+
+
+class _Window(object):
+    """Class for a fixed-size window with running sum and sum of squares."""
+
+    # recompute the sums from scratch this often to drop rounding drift
+    RESUM_EVERY = 10000
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.squares = 0.0
+        self._pushed = 0
+
+    def push(self, value):
+        self.values.append(value)
+        self.total += value
+        self.squares += value * value
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.squares -= old * old
+        self._pushed += 1
+        if self._pushed % self.RESUM_EVERY == 0:
+            self.total = math.fsum(self.values)
+            self.squares = math.fsum(value * value for value in self.values)
+
+
+class _Extreme(object):
+    """Class for the max (or min) of the last ``size`` values, amortized O(1)."""
+
+    def __init__(self, size, largest):
+        self.size = size
+        self.largest = largest
+        self.count = 0
+        self.items = deque()
+
+    def push(self, value):
+        if self.largest:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        self.items.append((self.count, value))
+        self.count += 1
+        if self.items[0][0] <= self.count - 1 - self.size:
+            self.items.popleft()
+
+    def get(self):
+        return self.items[0][1] if self.items else None
+
+
+class SMA(Indicator):
+    """Class for the simple moving average of the close."""
+
+    def __init__(self, period):
+        super(SMA, self).__init__()
+        self.period = period
+        self._closed = _Window(period - 1)
+
+    def _commit(self, high, low, close):
+        self._closed.push(close)
+
+    def _current(self, high, low, close):
+        if len(self._closed.values) < self.period - 1:
+            return None
+        return (self._closed.total + close) / self.period
+
+
+class EMA(Indicator):
+    """Class for the exponential moving average of the close, seeded with the SMA."""
+
+    def __init__(self, period):
+        super(EMA, self).__init__()
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._ema = None
+        self._seed = []
+
+    def _commit(self, high, low, close):
+        if self._ema is None:
+            self._seed.append(close)
+            if len(self._seed) == self.period:
+                self._ema = sum(self._seed) / self.period
+                self._seed = None
+        else:
+            self._ema += self.alpha * (close - self._ema)
+
+    def _current(self, high, low, close):
+        if self._ema is None:
+            return None
+        return self._ema + self.alpha * (close - self._ema)
+
+
+class RSI(Indicator):
+    """Class for Wilder's relative strength index."""
+
+    def __init__(self, period=14):
+        super(RSI, self).__init__()
+        self.period = period
+        self._previous = None
+        self._gain = 0.0
+        self._loss = 0.0
+        self._count = 0
+
+    def _smooth(self, close):
+        change = close - self._previous
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self._count < self.period:
+            # plain average over the first period
+            count = self._count + 1
+            return ((self._gain * self._count + gain) / count,
+                    (self._loss * self._count + loss) / count, count)
+        return ((self._gain * (self.period - 1) + gain) / self.period,
+                (self._loss * (self.period - 1) + loss) / self.period, self._count + 1)
+
+    def _commit(self, high, low, close):
+        if self._previous is not None:
+            self._gain, self._loss, self._count = self._smooth(close)
+        self._previous = close
+
+    def _current(self, high, low, close):
+        if self._previous is None:
+            return None
+        gain, loss, count = self._smooth(close)
+        if count < self.period:
+            return None
+        if loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+class BollingerBands(Indicator):
+    """Class for Bollinger bands, ``value`` is (middle, upper, lower)."""
+
+    def __init__(self, period=20, deviations=2.0):
+        super(BollingerBands, self).__init__()
+        self.period = period
+        self.deviations = deviations
+        self._closed = _Window(period - 1)
+
+    def _commit(self, high, low, close):
+        self._closed.push(close)
+
+    def _current(self, high, low, close):
+        if len(self._closed.values) < self.period - 1:
+            return None
+        mean = (self._closed.total + close) / self.period
+        variance = (self._closed.squares + close * close) / self.period - mean * mean
+        width = self.deviations * math.sqrt(max(variance, 0.0))
+        return mean, mean + width, mean - width
+
+
+class ATR(Indicator):
+    """Class for Wilder's average true range."""
+
+    def __init__(self, period=14):
+        super(ATR, self).__init__()
+        self.period = period
+        self._previous = None
+        self._atr = 0.0
+        self._count = 0
+
+    def _true_range(self, high, low):
+        if self._previous is None:
+            return high - low
+        return max(high - low, abs(high - self._previous), abs(low - self._previous))
+
+    def _smooth(self, high, low):
+        true_range = self._true_range(high, low)
+        if self._count < self.period:
+            count = self._count + 1
+            return (self._atr * self._count + true_range) / count, count
+        return (self._atr * (self.period - 1) + true_range) / self.period, self._count + 1
+
+    def _commit(self, high, low, close):
+        self._atr, self._count = self._smooth(high, low)
+        self._previous = close
+
+    def _current(self, high, low, close):
+        atr, count = self._smooth(high, low)
+        return atr if count >= self.period else None
+
+
+class Stochastic(Indicator):
+    """Class for the stochastic oscillator, ``value`` is (%K, %D)."""
+
+    def __init__(self, k_period=14, d_period=3):
+        super(Stochastic, self).__init__()
+        self.k_period = k_period
+        self.d_period = d_period
+        self._highs = _Extreme(k_period - 1, True)
+        self._lows = _Extreme(k_period - 1, False)
+        self._seen = 0
+        self._closed_k = _Window(d_period - 1)
+
+    def _k(self, high, low, close):
+        if self._seen < self.k_period - 1:
+            return None
+        highest = high if self._highs.get() is None else max(self._highs.get(), high)
+        lowest = low if self._lows.get() is None else min(self._lows.get(), low)
+        if highest == lowest:
+            return 50.0
+        return 100.0 * (close - lowest) / (highest - lowest)
+
+    def _commit(self, high, low, close):
+        k_value = self._k(high, low, close)
+        if k_value is not None:
+            self._closed_k.push(k_value)
+        self._highs.push(high)
+        self._lows.push(low)
+        self._seen += 1
+
+    def _current(self, high, low, close):
+        k_value = self._k(high, low, close)
+        if k_value is None:
+            return None
+        if len(self._closed_k.values) < self.d_period - 1:
+            return k_value, None
+        return k_value, (self._closed_k.total + k_value) / self.d_period
+
+
+class IndicatorEngine(object):
+    """Class for the indicators of every streamed (active, size).
+
+    :meth:`attach` hooks a :class:`CandleRingBuffer
+    <quotexapi.ws.objects.candles.CandleRingBuffer>` so every candle it
+    stores is fed to the indicators registered for its (active, size).
+    The indicator dicts are replaced, never changed, so the websocket
+    thread can iterate them while another thread adds or removes one.
+    """
+
+    def __init__(self):
+        self._indicators = {}
+        self._lock = threading.Lock()
+
+    def attach(self, ACTIVE, size, buffer):
+        """Feed the candles of ``buffer`` to the indicators of (ACTIVE, size)."""
+        key = (ACTIVE, size)
+
+        def feed(timestamp, open, high, low, close, volume):  # pylint: disable=redefined-builtin
+            for indicator in self._indicators.get(key, {}).values():
+                indicator.update(timestamp, open, high, low, close, volume)
+
+        buffer.listeners.append(feed)
+
+    def add(self, ACTIVE, size, name, indicator, buffer=None):
+        """Register an indicator, warming it up with the candles already in ``buffer``."""
+        if buffer is not None:
+            rows = buffer.rows()
+            for start in range(0, len(rows), 6):
+                indicator.update(*rows[start:start + 6])
+        with self._lock:
+            indicators = dict(self._indicators.get((ACTIVE, size), {}))
+            indicators[name] = indicator
+            self._indicators[(ACTIVE, size)] = indicators
+        return indicator
+
+    def remove(self, ACTIVE, size, name):
+        """Unregister an indicator."""
+        with self._lock:
+            indicators = dict(self._indicators.get((ACTIVE, size), {}))
+            indicators.pop(name, None)
+            self._indicators[(ACTIVE, size)] = indicators
+
+    def values(self, ACTIVE, size):
+        """Return the current value of every indicator of (ACTIVE, size)."""
+        return {name: indicator.value
+                for name, indicator in self._indicators.get((ACTIVE, size), {}).items()}
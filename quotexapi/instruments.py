@@ -0,0 +1,223 @@
+"""Module for the indexed, refreshable Quotex instrument catalog."""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from quotexapi.constants import ACTIVES
+
+# columns of one row of the server ``instruments/list`` reply
+_ROW_ID, _ROW_NAME, _ROW_TITLE, _ROW_TYPE = 0, 1, 2, 3
+_ROW_OPEN, _ROW_PAYOUT = 14, 18
+
+
+def default_cache_path():
+    """Return the catalog cache file, ``$QUOTEX_CACHE_DIR/instruments.json`` or
+    ``~/.cache/quotexapi/instruments.json``."""
+    directory = os.environ.get("QUOTEX_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "quotexapi")
+    return os.path.join(directory, "instruments.json")
+
+
+class Instrument(object):
+    """Class for the metadata of one Quotex instrument."""
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    __slots__ = ("id", "name", "title", "type", "otc", "payout", "is_open", "hours")
+
+    def __init__(self, id, name, title=None, type=None, payout=None,  # pylint: disable=redefined-builtin
+                 is_open=None, hours=()):
+        """
+        :param int id: The server side instrument id.
+        :param str name: The active name, e.g. ``"EURUSD_otc"``.
+        :param str title: The display name.
+        :param str type: The instrument type, e.g. ``"currency"``.
+        :param float payout: The profit percent of a won option.
+        :param bool is_open: The trading flag of the last refresh.
+        :param hours: List of (open, close) unix times of the trading sessions.
+        """
+        self.id = int(id)  # pylint: disable=invalid-name
+        self.name = name
+        self.title = title or name
+        self.type = type
+        self.otc = name.lower().endswith("_otc")
+        self.payout = payout
+        self.is_open = is_open
+        self.hours = [tuple(session) for session in hours]
+
+    @classmethod
+    def from_server(cls, item):
+        """Build an instrument from one row (list or dict) of ``instruments/list``."""
+        if isinstance(item, dict):
+            return cls(item["id"], item.get("symbol") or item["name"], item.get("name"),
+                       item.get("type"), item.get("payout", item.get("profit")),
+                       item.get("is_open", item.get("open")), item.get("hours", ()))
+        return cls(item[_ROW_ID], item[_ROW_NAME],
+                   item[_ROW_TITLE] if len(item) > _ROW_TITLE else None,
+                   item[_ROW_TYPE] if len(item) > _ROW_TYPE else None,
+                   item[_ROW_PAYOUT] if len(item) > _ROW_PAYOUT else None,
+                   bool(item[_ROW_OPEN]) if len(item) > _ROW_OPEN else None)
+
+    def trading_at(self, now=None):
+        """Return True when the instrument can be traded at ``now``.
+
+        Uses the session hours when known, the trading flag otherwise.
+        """
+        if self.hours:
+            now = now if now is not None else time.time()
+            return any(start <= now < end for start, end in self.hours)
+        return bool(self.is_open)
+
+    def to_dict(self):
+        """Return the instrument as a JSON serializable dict."""
+        return {"id": self.id, "name": self.name, "title": self.title, "type": self.type,
+                "payout": self.payout, "is_open": self.is_open,
+                "hours": [list(session) for session in self.hours]}
+
+    def __repr__(self):
+        return "Instrument(%d, %r)" % (self.id, self.name)
+
+
+class InstrumentCatalog(object):
+    """Class for the instruments indexed by name and by id.
+
+    Starts from :data:`quotexapi.constants.ACTIVES`, then the local cache
+    file (:meth:`load`), and is refreshed from the server
+    ``instruments/list`` reply (:meth:`update`), which also rewrites the
+    cache in the background so the next start does not wait for the server.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param str path: The cache file, see :func:`default_cache_path`.
+        """
+        self.path = path or default_cache_path()
+        self.updated_at = None
+        self.version = 0
+        self._by_name = {}
+        self._by_id = {}
+        self._condition = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._index(Instrument(active_id, name) for name, active_id in ACTIVES.items())
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(list(self._by_name.values()))
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        """Return the :class:`Instrument` of an active name or id."""
+        if isinstance(key, int):
+            return self._by_id.get(key, default)
+        return self._by_name.get(key, default)
+
+    def id_of(self, name):
+        """Return the id of an active name, raise KeyError when unknown."""
+        return self._by_name[name].id
+
+    def name_of(self, active_id):
+        """Return the active name of an id, raise KeyError when unknown."""
+        return self._by_id[active_id].name
+
+    def otc(self):
+        """Return the OTC instruments."""
+        return [instrument for instrument in self if instrument.otc]
+
+    def regular(self):
+        """Return the instruments traded on the regular market."""
+        return [instrument for instrument in self if not instrument.otc]
+
+    def open_now(self, now=None):
+        """Return the instruments that can be traded at ``now``."""
+        return [instrument for instrument in self if instrument.trading_at(now)]
+
+    def update(self, items, save=True):
+        """Refresh from the server ``instruments/list`` reply.
+
+        Called on the websocket thread, so the cache file is rewritten on
+        a background thread.
+
+        :param items: The rows of the reply.
+        :param bool save: Rewrite the cache file.
+        """
+        instruments = [Instrument.from_server(item) for item in items]
+        self._index(instruments)
+        self.updated_at = time.time()
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+        if save:
+            self.save_async()
+
+    def wait_update(self, version, timeout=None):
+        """Wait until the catalog is refreshed past ``version``.
+
+        :returns: True when refreshed, False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.version > version, timeout)
+
+    def load(self):
+        """Merge the cache file into the catalog.
+
+        :returns: True when the cache file was read.
+        """
+        try:
+            with open(self.path) as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return False
+        self._index(Instrument(**item) for item in data.get("instruments", ()))
+        self.updated_at = data.get("updated_at")
+        return True
+
+    def save(self):
+        """Write the catalog to the cache file atomically."""
+        directory = os.path.dirname(self.path)
+        with self._save_lock:
+            os.makedirs(directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "w") as output:
+                    json.dump({"updated_at": self.updated_at,
+                               "instruments": [instrument.to_dict() for instrument in self]},
+                              output)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+
+    def save_async(self):
+        """Write the cache file on a daemon thread, see :meth:`save`.
+
+        :returns: The started thread.
+        """
+        thread = threading.Thread(target=self._save_quietly, name="quotex-instruments-save")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _save_quietly(self):
+        try:
+            self.save()
+        except OSError:
+            logging.getLogger(__name__).warning(
+                "can not write the instrument cache %s", self.path, exc_info=True)
+
+    def _index(self, instruments):
+        # build new dicts and swap them, so readers never see a half update
+        by_name = dict(self._by_name)
+        by_id = dict(self._by_id)
+        for instrument in instruments:
+            previous = by_name.get(instrument.name)
+            if previous is not None and by_id.get(previous.id) is previous:
+                del by_id[previous.id]
+            by_name[instrument.name] = instrument
+            by_id[instrument.id] = instrument
+        self._by_name, self._by_id = by_name, by_id
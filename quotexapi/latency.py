@@ -0,0 +1,176 @@
+"""Module for latency histograms and RTT estimates of Quotex requests."""
+import bisect
+import math
+import threading
+
+# stages of one order, each measured from the end of the previous one
+BUY_STAGES = ("validate", "serialize", "enqueue", "write", "ack", "deliver", "total")
+
+
+class LatencyHistogram(object):
+    """Class for a log-scale latency histogram.
+
+    Buckets grow by ``10 ** (1 / per_decade)`` from ``lowest`` seconds, so
+    the percentiles have a bounded relative error whatever the range.
+    """
+
+    def __init__(self, lowest=1e-6, highest=100.0, per_decade=20):
+        """
+        :param float lowest: Upper bound in seconds of the first bucket.
+        :param float highest: Samples above go to the last bucket.
+        :param int per_decade: Buckets per factor of ten.
+        """
+        decades = math.log10(highest / lowest)
+        self.bounds = [lowest * 10 ** (index / float(per_decade))
+                       for index in range(int(math.ceil(decades * per_decade)) + 1)]
+        self.reset()
+
+    def reset(self):
+        """Forget every sample."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Record one sample in seconds."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, point):
+        """Return the upper bound of the bucket holding the ``point`` percentile."""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(self.count * point / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self, points=(50, 90, 99)):
+        """Export the histogram in milliseconds.
+
+        :returns: Dict with count, mean, min, max, the percentiles and the
+            non empty buckets as [upper bound, count] pairs.
+        """
+        if not self.count:
+            return {"count": 0}
+        result = {"count": self.count, "mean_ms": self.total / self.count * 1000,
+                  "min_ms": self.min * 1000, "max_ms": self.max * 1000}
+        for point in points:
+            result["p%d_ms" % point] = self.percentile(point) * 1000
+        result["buckets_ms"] = [
+            [self.bounds[index] * 1000 if index < len(self.bounds) else None, count]
+            for index, count in enumerate(self.counts) if count]
+        return result
+
+
+class LatencyRecorder(object):
+    """Class for the latency histograms of every (active, stage)."""
+
+    def __init__(self, stages=BUY_STAGES):
+        """
+        :param stages: The stage names, in order.
+        """
+        self.stages = stages
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, active, stamps):
+        """Record the stage latencies of one request.
+
+        :param str active: The active name.
+        :param stamps: ``time.perf_counter()`` at the start followed by one
+            stamp per stage except "total"; the stages stop at the first
+            None stamp (a failed or timed out request), "total" always runs
+            to the last stamp, which must be set.
+        """
+        with self._lock:
+            histograms = self._histograms.get(active)
+            if histograms is None:
+                histograms = self._histograms[active] = {
+                    stage: LatencyHistogram() for stage in self.stages}
+            previous = stamps[0]
+            for stage, stamp in zip(self.stages, stamps[1:]):
+                if stamp is None:
+                    break
+                histograms[stage].add(max(stamp - previous, 0.0))
+                previous = stamp
+            histograms["total"].add(max(stamps[-1] - stamps[0], 0.0))
+
+    def export(self, active=None):
+        """Return {active: {stage: histogram dict}}, of one active if given."""
+        with self._lock:
+            actives = [active] if active is not None else list(self._histograms)
+            return {name: {stage: histogram.to_dict()
+                           for stage, histogram in self._histograms[name].items()}
+                    for name in actives if name in self._histograms}
+
+    def reset(self, active=None):
+        """Forget the samples of one active, or of every active."""
+        with self._lock:
+            if active is None:
+                self._histograms.clear()
+            else:
+                self._histograms.pop(active, None)
+
+
+class RttEstimator(object):
+    """Class for a rolling round trip time estimate.
+
+    Keeps the minimum, an EWMA (``alpha`` = 1/8 as TCP's smoothed RTT) and
+    the p99 of the last ``window`` samples.
+    """
+
+    def __init__(self, alpha=0.125, window=256):
+        """
+        :param float alpha: Weight of a new sample in the EWMA.
+        :param int window: Samples the p99 is computed on.
+        """
+        self.alpha = alpha
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        """Forget every sample."""
+        self.count = 0
+        self.last = None
+        self.min = None
+        self.ewma = None
+        self._samples = []
+        self._next = 0
+
+    def add(self, rtt):
+        """Record one round trip in seconds."""
+        self.count += 1
+        self.last = rtt
+        self.min = rtt if self.min is None else min(self.min, rtt)
+        self.ewma = rtt if self.ewma is None else self.ewma + self.alpha * (rtt - self.ewma)
+        if len(self._samples) < self.window:
+            self._samples.append(rtt)
+        else:
+            self._samples[self._next] = rtt
+            self._next = (self._next + 1) % self.window
+
+    def percentile(self, point):
+        """Return the ``point`` percentile of the last samples, None without any."""
+        ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(math.ceil(len(ordered) * point / 100.0)) - 1)]
+
+    def to_dict(self):
+        """Export the estimate in milliseconds."""
+        def millis(value):
+            return value * 1000 if value is not None else None
+        return {"count": self.count, "last_ms": millis(self.last), "min_ms": millis(self.min),
+                "ewma_ms": millis(self.ewma), "p99_ms": millis(self.percentile(99))}
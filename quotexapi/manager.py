@@ -0,0 +1,306 @@
+"""Module for running many Quotex accounts across worker processes."""
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import wait
+
+# stable_api methods whose calls are replayed on a restarted worker
+STREAM_METHODS = {
+    "start_candles_stream": "stop_candles_stream",
+    "start_candles_one_stream": "stop_candles_one_stream",
+    "start_candles_all_size_stream": "stop_candles_all_size_stream",
+}
+
+
+def _worker_main(index, ssids, commands, results, threads):
+    """Entry point of one worker process.
+
+    Connects every account of the shard, then runs the commands it receives
+    on a small thread pool so a slow call does not block the other accounts.
+    """
+    from quotexapi.stable_api import Quotex  # pylint: disable=import-outside-toplevel
+    logger = logging.getLogger(__name__)
+    clients = {}
+    status = {}
+    for ssid in ssids:
+        clients[ssid] = Quotex(ssid)
+        try:
+            status[ssid] = clients[ssid].connect()
+        except Exception as error:  # pylint: disable=broad-except
+            status[ssid] = (False, str(error))
+    results.put((index, None, True, status))
+
+    def run(call_id, ssid, method, args, kwargs):
+        try:
+            value = getattr(clients[ssid], method)(*args, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception("%s failed", method)
+            try:
+                pickle.dumps(error)
+            except Exception:  # pylint: disable=broad-except
+                error = RuntimeError(repr(error))
+            results.put((index, call_id, False, error))
+        else:
+            # the queue pickles on its feeder thread, which only logs a
+            # failure and drops the item: the caller would wait forever
+            try:
+                pickle.dumps(value)
+            except Exception as error:  # pylint: disable=broad-except
+                results.put((index, call_id, False, TypeError(
+                    "%s returned an unpicklable %s: %s" % (method, type(value).__name__, error))))
+            else:
+                results.put((index, call_id, True, value))
+
+    with ThreadPoolExecutor(threads) as executor:
+        while True:
+            command = commands.get()
+            if command is None:
+                break
+            executor.submit(run, *command)
+    for client in clients.values():
+        client.close()
+
+
+class _Worker(object):
+    """Class for the parent side of one worker process."""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, index, ssids, results, threads, context, crashes=0):
+        self.index = index
+        self.ssids = list(ssids)
+        self.commands = context.Queue()
+        self.pending = set()
+        # consecutive crashes of the process of this shard
+        self.crashes = crashes
+        self.started_at = time.time()
+        # reason the calls are refused while it waits for a restart or gave up
+        self.down = None
+        self.process = context.Process(
+            target=_worker_main, name="quotex-worker-%d" % index,
+            args=(index, self.ssids, self.commands, results, threads))
+        self.process.daemon = True
+        self.process.start()
+
+
+class QuotexManager(object):
+    """Class for sharding Quotex accounts across worker processes.
+
+    Every worker process holds the :class:`Quotex
+    <quotexapi.stable_api.Quotex>` connections of its shard. Calls are routed
+    by ssid and return a :class:`concurrent.futures.Future`. A supervisor
+    thread fails the pending calls of a dead worker, restarts it with
+    exponential backoff and replays its stream subscriptions on the new
+    process; after ``max_restarts`` crashes in a row the shard stays down.
+    """
+
+    def __init__(self, ssids, workers=None, threads_per_worker=4, start_method=None):
+        """
+        :param list ssids: The session identifiers of every account.
+        :param int workers: Number of worker processes, defaults to the core count.
+        :param int threads_per_worker: Calls run concurrently inside a worker.
+        :param str start_method: The multiprocessing start method.
+        """
+        self.ssids = list(ssids)
+        self.workers_count = max(1, min(workers or os.cpu_count() or 1, len(self.ssids)))
+        self.threads_per_worker = threads_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._results = self._context.Queue()
+        self._call_ids = itertools.count(1)
+        self._futures = {}
+        self._streams = {ssid: [] for ssid in self.ssids}
+        self._route = {}
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closing = False
+        self._supervisor = None
+        self._collector = None
+        self.status = {}
+        self.restarts = 0
+        # a worker that ran restart_max_delay seconds before dying is restarted
+        # right away, a crash loop waits up to restart_max_delay between tries
+        self.restart_base_delay = 0.5
+        self.restart_max_delay = 30
+        self.max_restarts = 10
+        self._restart_at = {}
+
+    def start(self):
+        """Start the worker processes and the supervisor thread."""
+        for index in range(self.workers_count):
+            self._workers.append(self._spawn(index, self.ssids[index::self.workers_count]))
+        self._collector = threading.Thread(target=self._collect, name="quotex-collector")
+        self._collector.daemon = True
+        self._collector.start()
+        self._supervisor = threading.Thread(target=self._supervise, name="quotex-supervisor")
+        self._supervisor.daemon = True
+        self._supervisor.start()
+        return self
+
+    def close(self):
+        """Stop every worker process."""
+        self._closing = True
+        for worker in self._workers:
+            worker.commands.put(None)
+        for worker in self._workers:
+            worker.process.join(5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        self._results.put(None)
+        self._collector.join(5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.close()
+
+    def worker_of(self, ssid):
+        """Return the index of the worker holding ``ssid``."""
+        return self._route[ssid]
+
+    def call(self, ssid, method, *args, **kwargs):
+        """Call a :class:`Quotex <quotexapi.stable_api.Quotex>` method of one account.
+
+        :param str ssid: The account session identifier.
+        :param str method: The method name, e.g. ``"buy"``.
+        :returns: The instance of :class:`concurrent.futures.Future`.
+        """
+        future = Future()
+        with self._lock:
+            worker = self._workers[self._route[ssid]]
+            if worker.down is not None:
+                future.set_exception(RuntimeError(worker.down))
+                return future
+            call_id = next(self._call_ids)
+            self._futures[call_id] = future
+            worker.pending.add(call_id)
+            if method in STREAM_METHODS:
+                self._streams[ssid].append((method, args, kwargs))
+            elif method in STREAM_METHODS.values():
+                self._forget_stream(ssid, method, args)
+            worker.commands.put((call_id, ssid, method, args, kwargs))
+        return future
+
+    def broadcast(self, method, *args, **kwargs):
+        """Call a method on every account.
+
+        :returns: Dict of ssid to :class:`concurrent.futures.Future`.
+        """
+        return {ssid: self.call(ssid, method, *args, **kwargs) for ssid in self.ssids}
+
+    def buy(self, ssid, ACTIVES, price, ACTION, expirations):
+        """Buy a binary option on one account."""
+        return self.call(ssid, "buy", ACTIVES, price, ACTION, expirations)
+
+    def buy_multi(self, ssid, orders):
+        """Buy several binary options on one account without waiting for each ack."""
+        return self.call(ssid, "buy_multi", orders)
+
+    def check_win(self, ssid, id_number):
+        """Check the result of an option of one account."""
+        return self.call(ssid, "check_win", id_number)
+
+    def start_candles_stream(self, ssid, ACTIVE, size, maxdict):
+        """Start a realtime candle stream on one account."""
+        return self.call(ssid, "start_candles_stream", ACTIVE, size, maxdict)
+
+    def stop_candles_stream(self, ssid, ACTIVE, size):
+        """Stop a realtime candle stream on one account."""
+        return self.call(ssid, "stop_candles_stream", ACTIVE, size)
+
+    def get_realtime_candles(self, ssid, ACTIVE, size):
+        """Get the realtime candles of one account."""
+        return self.call(ssid, "get_realtime_candles", ACTIVE, size)
+
+    # ________________________________________________________________________
+
+    def _spawn(self, index, ssids, crashes=0):
+        worker = _Worker(index, ssids, self._results, self.threads_per_worker, self._context,
+                         crashes)
+        for ssid in ssids:
+            self._route[ssid] = index
+        return worker
+
+    def _forget_stream(self, ssid, stop_method, args):
+        start_methods = [start for start, stop in STREAM_METHODS.items() if stop == stop_method]
+        self._streams[ssid] = [
+            (method, start_args, kwargs) for method, start_args, kwargs in self._streams[ssid]
+            if not (method in start_methods and start_args[:len(args)] == args)]
+
+    def _supervise(self):
+        logger = logging.getLogger(__name__)
+        while not self._closing:
+            now = time.time()
+            for index, due in list(self._restart_at.items()):
+                if due <= now:
+                    del self._restart_at[index]
+                    self._restart(index)
+            timeout = min([1.0] + [due - now for due in self._restart_at.values()])
+            watched = [worker for worker in self._workers if worker.down is None]
+            sentinels = [worker.process.sentinel for worker in watched]
+            if not sentinels:
+                time.sleep(max(timeout, 0.0))
+                continue
+            for ready in wait(sentinels, timeout=max(timeout, 0.0)):
+                if not self._closing:
+                    self._on_exit(watched[sentinels.index(ready)], logger)
+
+    def _collect(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            index, call_id, ok, value = item
+            with self._lock:
+                if call_id is None:
+                    self.status.update(value)
+                    continue
+                future = self._futures.pop(call_id, None)
+                self._workers[index].pending.discard(call_id)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _on_exit(self, dead, logger):
+        index = dead.index
+        with self._lock:
+            for call_id in dead.pending:
+                future = self._futures.pop(call_id, None)
+                if future is not None:
+                    future.set_exception(RuntimeError("worker %d died" % index))
+            dead.pending.clear()
+            if time.time() - dead.started_at >= self.restart_max_delay:
+                dead.crashes = 1
+            else:
+                dead.crashes += 1
+            if self.max_restarts is not None and dead.crashes > self.max_restarts:
+                dead.down = "worker %d gave up after %d crashes" % (index, dead.crashes)
+                logger.error("worker %d died with exit code %s, %s",
+                             index, dead.process.exitcode, dead.down)
+                return
+            delay = min(self.restart_max_delay,
+                        self.restart_base_delay * 2 ** (dead.crashes - 1))
+            dead.down = "worker %d died, restarting" % index
+            self._restart_at[index] = time.time() + delay
+            logger.error("worker %d died with exit code %s, restart in %.2fs",
+                         index, dead.process.exitcode, delay)
+
+    def _restart(self, index):
+        with self._lock:
+            if self._closing:
+                return
+            dead = self._workers[index]
+            worker = self._spawn(index, dead.ssids, dead.crashes)
+            self._workers[index] = worker
+            self.restarts += 1
+            for ssid in worker.ssids:
+                for method, args, kwargs in self._streams[ssid]:
+                    call_id = next(self._call_ids)
+                    worker.commands.put((call_id, ssid, method, args, kwargs))
@@ -0,0 +1,337 @@
+"""Module for a local stand-in of the Quotex socket.io server.
+
+The server speaks the websocket transport of socket.io with ``EIO=3`` (the
+protocol :attr:`QuotexAPI.wss_url <quotexapi.api.QuotexAPI.wss_url>`
+targets) using only the standard library, so the client can be measured
+without the live service.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import random
+import struct
+import threading
+import time
+import uuid
+
+_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+def encode_frame(payload, opcode):
+    """Encode one unmasked server to client websocket frame."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_frame(reader):
+    """Read one client frame.
+
+    :returns: Tuple of (opcode, payload bytes).
+    """
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class MockSession(object):
+    """Class for one client connection of :class:`MockQuotexServer`."""
+
+    def __init__(self, server, writer):
+        self.server = server
+        self.writer = writer
+        self.authorized = False
+        self.candle_subscriptions = set()
+        self.received = 0
+
+    def send_text(self, text):
+        """Send one text frame."""
+        self.writer.write(encode_frame(text, OPCODE_TEXT))
+
+    def send_event(self, name, data=None):
+        """Send a socket.io event ``42["name",data]``."""
+        packet = [name] if data is None else [name, data]
+        self.send_text("42" + json.dumps(packet))
+
+    def send_binary_event(self, name, data):
+        """Send a socket.io binary event: a placeholder then the payload frame."""
+        self.send_text('451-["%s",{"_placeholder":true,"num":0}]' % name)
+        self.writer.write(encode_frame(b"\x04" + json.dumps(data).encode("utf-8"),
+                                       OPCODE_BINARY))
+
+
+class MockQuotexServer(object):
+    """Class for a scriptable local Quotex socket.io server.
+
+    Replies to ``authorization``, ``orders/open``, ``history/load/line``,
+    ``instruments/list`` and ``instruments/update``. Candle and tick streams are pushed with
+    :meth:`push_candles` / :meth:`push_ticks` (run them with :meth:`run`),
+    or generated continuously at ``candle_rate`` updates per second for
+    every subscription. ``order_handler`` and ``history_handler`` can be
+    replaced to script the replies.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, host="127.0.0.1", port=0, order_delay=0.0, payout=0.8,
+                 candle_rate=0, reject_ssids=(), expiration_scale=1.0):
+        """
+        :param str host: The interface to listen on.
+        :param int port: The port, 0 picks a free one.
+        :param float order_delay: Seconds before an order is acknowledged.
+        :param float payout: Profit ratio of a won option.
+        :param float candle_rate: Candle updates per second per subscription.
+        :param reject_ssids: Sessions answered with ``authorization/reject``.
+        :param float expiration_scale: Factor applied to option durations.
+        """
+        self.host = host
+        self.port = port
+        self.order_delay = order_delay
+        self.payout = payout
+        self.candle_rate = candle_rate
+        self.reject_ssids = set(reject_ssids)
+        self.expiration_scale = expiration_scale
+        self.order_handler = self._default_order
+        self.history_handler = self._default_history
+        self.sessions = []
+        self.orders = {}
+        self.loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._prices = {}
+
+    @property
+    def url(self):
+        """Property to get the websocket url clients connect to."""
+        return "ws://{}:{}/socket.io/?EIO=3&transport=websocket".format(self.host, self.port)
+
+    # ------------------------------------------------------------------ run
+
+    def start(self):
+        """Run the server on its own event loop thread.
+
+        :returns: The websocket url.
+        """
+        self._thread = threading.Thread(target=self._run, name="quotex-mock-server")
+        self._thread.daemon = True
+        self._thread.start()
+        self._ready.wait()
+        return self.url
+
+    def stop(self):
+        """Stop the server thread."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def serve_forever(self):
+        """Run the server in the calling thread."""
+        self._run()
+
+    def run(self, coroutine):
+        """Run a coroutine on the server loop and wait for its result.
+
+        Example: ``server.run(server.push_candles("EURUSD", 60, 10000))``.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._server = self.loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    # -------------------------------------------------------------- streams
+
+    async def push_candles(self, active, size, count, session=None):
+        """Push ``count`` ``candles/update`` events of one (active, size) as fast as possible."""
+        now = int(time.time())
+        for number in range(count):
+            candle = self._next_candle(active, size, now)
+            for target in self._targets(session):
+                target.send_event("candles/update", candle)
+            if number % 500 == 499:
+                await self._drain(session)
+        await self._drain(session)
+
+    async def push_ticks(self, active, count, session=None):
+        """Push ``count`` binary ``quotes/stream`` ticks of one active as fast as possible."""
+        for number in range(count):
+            tick = [[active, time.time(), self._next_price(active), 0]]
+            for target in self._targets(session):
+                target.send_binary_event("quotes/stream", tick)
+            if number % 500 == 499:
+                await self._drain(session)
+        await self._drain(session)
+
+    def _targets(self, session):
+        return [session] if session is not None else list(self.sessions)
+
+    async def _drain(self, session):
+        for target in self._targets(session):
+            await target.writer.drain()
+
+    def _next_price(self, active):
+        price = self._prices.get(active, 1.0) * (1 + random.gauss(0, 0.0005))
+        self._prices[active] = price
+        return round(price, 6)
+
+    def _next_candle(self, active, size, now):
+        open_ = self._prices.get(active, 1.0)
+        close = self._next_price(active)
+        return {"asset": active, "period": size, "from": now - now % size,
+                "open": open_, "close": close, "min": min(open_, close),
+                "max": max(open_, close), "volume": random.randint(1, 100)}
+
+    async def _stream_candles(self, session):
+        while True:
+            await asyncio.sleep(1.0 / self.candle_rate)
+            now = int(time.time())
+            for active, size in list(session.candle_subscriptions):
+                session.send_event("candles/update", self._next_candle(active, size, now))
+
+    # ------------------------------------------------------------- handlers
+
+    def _default_order(self, session, payload):  # pylint: disable=unused-argument
+        now = time.time()
+        return {"id": uuid.uuid4().hex, "requestId": payload.get("requestId"),
+                "asset": payload.get("asset"), "amount": payload.get("amount"),
+                "command": 0 if payload.get("action") == "call" else 1,
+                "openTimestamp": now, "closeTimestamp": now + payload.get("time", 60),
+                "openPrice": self._prices.get(payload.get("asset"), 1.0)}
+
+    def _default_history(self, session, payload):  # pylint: disable=unused-argument
+        size = payload.get("period", 60)
+        end = int(payload.get("time") or time.time())
+        start = end - int(payload.get("offset", 0))
+        rows = []
+        price = 1.0
+        for timestamp in range(start - start % size, end + 1, size):
+            close = price * (1 + random.gauss(0, 0.001))
+            rows.append([timestamp, price, close, max(price, close), min(price, close), 1])
+            price = close
+        return {"asset": payload.get("asset"), "index": payload.get("index"),
+                "period": size, "candles": rows}
+
+    def _instrument_rows(self):
+        from quotexapi.constants import ACTIVES  # pylint: disable=import-outside-toplevel
+        rows = []
+        for active, active_id in ACTIVES.items():
+            row = [active_id, active, active.replace("_otc", " (OTC)"), "currency"]
+            row += [None] * 10 + [True, None, None, None, int(self.payout * 100)]
+            rows.append(row)
+        return rows
+
+    async def _on_order(self, session, payload):
+        if self.order_delay:
+            await asyncio.sleep(self.order_delay)
+        order = self.order_handler(session, payload)
+        self.orders[order["id"]] = order
+        session.send_binary_event("s_orders/open", order)
+        await session.writer.drain()
+        await asyncio.sleep(payload.get("time", 60) * self.expiration_scale)
+        win = random.random() < 0.5
+        profit = round(order["amount"] * self.payout, 2) if win else -order["amount"]
+        session.send_binary_event("s_orders/close", {"deals": [dict(order, profit=profit)]})
+        self.orders.pop(order["id"], None)
+
+    def _on_event(self, session, name, payload):
+        if name == "authorization":
+            session.authorized = payload.get("session") not in self.reject_ssids
+            session.send_event("s_authorization" if session.authorized else "authorization/reject")
+        elif name == "orders/open":
+            self.loop.create_task(self._on_order(session, payload))
+        elif name == "history/load/line":
+            session.send_binary_event("s_history/load/line", self.history_handler(session, payload))
+        elif name == "instruments/list":
+            session.send_binary_event("instruments/list", self._instrument_rows())
+        elif name == "instruments/update":
+            session.candle_subscriptions.add((payload["asset"], payload["period"]))
+        elif name == "instruments/unfollow":
+            session.candle_subscriptions.discard((payload["asset"], payload["period"]))
+
+    async def _handshake(self, reader, writer):
+        request = await reader.readuntil(b"\r\n\r\n")
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        accept = base64.b64encode(hashlib.sha1(
+            (headers["sec-websocket-key"] + _GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                      "Sec-WebSocket-Accept: %s\r\n\r\n" % accept).encode())
+
+    async def _handle(self, reader, writer):
+        logger = logging.getLogger(__name__)
+        session = MockSession(self, writer)
+        streamer = None
+        try:
+            await self._handshake(reader, writer)
+            session.send_text("0" + json.dumps({"sid": uuid.uuid4().hex, "upgrades": [],
+                                                "pingInterval": 25000, "pingTimeout": 5000}))
+            session.send_text("40")
+            self.sessions.append(session)
+            if self.candle_rate:
+                streamer = self.loop.create_task(self._stream_candles(session))
+            while True:
+                opcode, payload = await read_frame(reader)
+                session.received += 1
+                if opcode == OPCODE_CLOSE:
+                    writer.write(encode_frame(payload[:2], OPCODE_CLOSE))
+                    break
+                if opcode == OPCODE_PING:
+                    writer.write(encode_frame(payload, OPCODE_PONG))
+                    continue
+                text = payload.decode("utf-8")
+                if text == "2":
+                    session.send_text("3")
+                elif text.startswith("42"):
+                    packet = json.loads(text[2:])
+                    self._on_event(session, packet[0], packet[1] if len(packet) > 1 else None)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("mock session failed")
+        finally:
+            if streamer is not None:
+                streamer.cancel()
+            if session in self.sessions:
+                self.sessions.remove(session)
+            writer.close()
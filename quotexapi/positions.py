@@ -0,0 +1,141 @@
+"""Module for the index of open Quotex positions and their results."""
+import threading
+import time
+from concurrent.futures import Future
+
+
+class Position(object):
+    """Class for one open option, resolved by its ``s_orders/close`` deal."""
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, order):
+        """
+        :param dict order: The ``s_orders/open`` reply.
+        """
+        self.id = order["id"]  # pylint: disable=invalid-name
+        self.active = order.get("asset")
+        self.amount = order.get("amount")
+        self.direction = "call" if order.get("command", 0) == 0 else "put"
+        self.opened_at = order.get("openTimestamp") or time.time()
+        self.expires_at = order.get("closeTimestamp") or self.opened_at
+        self.profit = None
+        self.closed_at = None
+        # resolved with the closing deal of the position
+        self.future = Future()
+
+    @property
+    def win(self):
+        """Property to get the result: "win", "loose", "equal" or None while open."""
+        if self.profit is None:
+            return None
+        if self.profit > 0:
+            return "win"
+        return "loose" if self.profit < 0 else "equal"
+
+    def add_callback(self, callback):
+        """Call ``callback(position)`` once the position is closed."""
+        self.future.add_done_callback(lambda future: callback(self))
+
+    def wait(self, timeout=None):
+        """Wait for the closing deal.
+
+        :returns: The deal dict, raise :class:`concurrent.futures.TimeoutError`.
+        """
+        return self.future.result(timeout)
+
+    def __await__(self):
+        import asyncio  # pylint: disable=import-outside-toplevel
+        return asyncio.wrap_future(self.future).__await__()
+
+    def __repr__(self):
+        return "Position(%r, %r, expires_at=%r, win=%r)" % (
+            self.id, self.active, self.expires_at, self.win)
+
+
+class PositionBook(object):
+    """Class for the open positions indexed by id and ordered by expiration.
+
+    The websocket thread adds a position from its ``s_orders/open`` reply
+    and closes it from the ``s_orders/close`` deals, resolving its future,
+    so no thread polls per order. The positions whose close never arrives
+    are abandoned by the expiration timers of :class:`Quotex
+    <quotexapi.stable_api.Quotex>`.
+    """
+
+    def __init__(self, keep_closed=10000):
+        """
+        :param int keep_closed: Closed positions kept for late lookups.
+        """
+        self.keep_closed = keep_closed
+        self._open = {}
+        self._closed = {}
+        self._closed_order = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._open)
+
+    def open(self, order):
+        """Register a position from its ``s_orders/open`` reply.
+
+        :returns: The :class:`Position`.
+        """
+        position = Position(order)
+        with self._lock:
+            self._open[position.id] = position
+        return position
+
+    def close(self, deal):
+        """Resolve a position from one deal of ``s_orders/close``.
+
+        :returns: The :class:`Position` or None when the id is unknown.
+        """
+        with self._lock:
+            position = self._open.pop(deal["id"], None)
+            if position is None:
+                return None
+            position.profit = deal.get("profit", 0)
+            position.closed_at = deal.get("closeTimestamp") or time.time()
+            self._closed[position.id] = position
+            self._closed_order.append(position.id)
+            if len(self._closed_order) > 2 * self.keep_closed:
+                for position_id in self._closed_order[:-self.keep_closed]:
+                    self._closed.pop(position_id, None)
+                del self._closed_order[:-self.keep_closed]
+        position.future.set_result(deal)
+        return position
+
+    def get(self, position_id):
+        """Return the open or recently closed :class:`Position` of an id."""
+        return self._open.get(position_id) or self._closed.get(position_id)
+
+    def open_positions(self):
+        """Return the open positions, soonest expiration first."""
+        with self._lock:
+            return sorted(self._open.values(), key=lambda position: position.expires_at)
+
+    def abandon(self, position_id, reason):
+        """Fail one open position whose close event never arrived.
+
+        :returns: The :class:`Position` or None when it is not open.
+        """
+        with self._lock:
+            position = self._open.pop(position_id, None)
+            if position is not None:
+                self._closed[position.id] = position
+                self._closed_order.append(position.id)
+        if position is not None:
+            position.future.set_exception(TimeoutError(reason))
+        return position
+
+    def fail(self, reason):
+        """Fail every open position, e.g. when its session is gone for good."""
+        with self._lock:
+            positions = list(self._open.values())
+            self._open.clear()
+            # kept for the lookups of a later check_win
+            for position in positions:
+                self._closed[position.id] = position
+                self._closed_order.append(position.id)
+        for position in positions:
+            position.future.set_exception(ConnectionError(reason))
@@ -1,12 +1,20 @@
 # python
 from quotexapi.api import QuotexAPI
-import quotexapi.global_value as global_value
+from quotexapi.ws.objects.candles import CandleAggregator, CandleRingBuffer, candle_from_row
+from quotexapi import history
+from quotexapi.indicators import IndicatorEngine
+from quotexapi.instruments import InstrumentCatalog
+from quotexapi.latency import LatencyRecorder
+from quotexapi.timer_wheel import TimerWheel
 import threading
 import time
 import logging
+import random
 import operator
 from collections import defaultdict
 from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
 
 def nested_dict(n, type):
     if n == 1:
@@ -16,14 +24,45 @@ def nested_dict(n, type):
 
 class Quotex:
     __version__ = "1.3"
-    def __init__(self, set_ssid):
+    def __init__(self, set_ssid, host="quotex.market", wss_url=None):
         self.size = [1, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800,
                     3600, 7200, 14400, 28800, 43200, 86400, 604800, 2592000]
         self.set_ssid = set_ssid
+        self.host = host
+        self.wss_url = wss_url
         self.suspend = 0.5
         self.subscribe_candle = []
         self.subscribe_candle_all_size = []
         self.subscribe_mood = []
+        self.subscribe_signals = False
+        # reconnect engine: jittered exponential backoff between attempts
+        self.auto_reconnect = True
+        self.reconnect_base_delay = 0.5
+        self.reconnect_max_delay = 30
+        self.reconnect_max_attempts = None
+        self.reconnect_history = deque(maxlen=100)
+        # historical candles: chunk size, requests in flight and disk cache
+        self.candles_chunk = 1000
+        self.candles_parallel = 8
+        self.candles_timeout = 30
+        self.candles_retries = 3
+        self.candles_cache = history.CandleCache()
+        self.indicators = IndicatorEngine()
+        # name <-> id catalog, read from the local cache and refreshed on connect
+        self.instruments = InstrumentCatalog()
+        self.instruments.load()
+        # per active histograms of the stages of buy()
+        self.latency = LatencyRecorder()
+        # one timer per open option: settlement check and expiry callbacks
+        self.expirations = TimerWheel()
+        self.settle_grace = 5
+        self.settle_timeout = 60
+        self.pnl = {"profit": 0.0, "win": 0, "loose": 0, "equal": 0, "abandoned": 0}
+        self._pnl_lock = threading.Lock()
+        self.api = None
+        self._closing = False
+        # held by connect() and reconnect(), reconnect() calls connect()
+        self._reconnect_lock = threading.RLock()
         
         # --start
         # self.connect()
@@ -53,24 +92,252 @@ class Quotex:
     # _____________________BUY________________________________
 
     # __________________FOR OPTION____________________________
-    def buy(self, ACTIVES, price, ACTION, expirations):
-        """ Buy Binary option""""
-        pass
+    def buy(self, ACTIVES, price, ACTION, expirations, timeout=30):
+        """ Buy Binary option
+
+        Every call has its own request id, so several threads can buy at
+        the same time without reading each other's order id.
+
+        The time spent in every stage is recorded per active, see
+        :meth:`get_latency_stats`.
+
+        :param int expirations: The expiration time in seconds.
+        :returns: Tuple of (success, order id or reason).
+        """
+        started = time.perf_counter()
+        direction, reason = self._check_order(price, ACTION, expirations)
+        if reason is not None:
+            return False, reason
+        validated = time.perf_counter()
+        future = self.api.buy(price, ACTIVES, direction, expirations)
+        return self._order_result(ACTIVES, future, started, validated, timeout)
+
+    def buy_multi(self, orders, timeout=30):
+        """Buy several binary options without waiting for each ack.
+
+        :param orders: List of (ACTIVES, price, ACTION, expirations) tuples.
+        :param float timeout: Seconds to wait for all the acks.
+        :returns: List of (success, order id or reason), in the order of ``orders``.
+        """
+        results = [None] * len(orders)
+        for index, check, value in self.iter_buy_multi(orders, timeout):
+            results[index] = (check, value)
+        return results
+
+    def iter_buy_multi(self, orders, timeout=30):
+        """Send every order back to back, then yield the results as they resolve.
+
+        :param orders: List of (ACTIVES, price, ACTION, expirations) tuples.
+        :param float timeout: Seconds to wait for all the acks.
+        :returns: Generator of (index in ``orders``, success, order id or reason).
+        """
+        deadline = time.time() + timeout
+        pending = {}
+        rejected = []
+        for index, (ACTIVES, price, ACTION, expirations) in enumerate(orders):
+            started = time.perf_counter()
+            direction, reason = self._check_order(price, ACTION, expirations)
+            if reason is not None:
+                rejected.append((index, False, reason))
+                continue
+            validated = time.perf_counter()
+            future = self.api.buy(price, ACTIVES, direction, expirations)
+            pending[future] = (index, ACTIVES, started, validated)
+        try:
+            for item in rejected:
+                yield item
+            try:
+                for future in as_completed(list(pending), max(deadline - time.time(), 0)):
+                    index, ACTIVES, started, validated = pending.pop(future)
+                    check, value = self._order_result(ACTIVES, future, started, validated, 0)
+                    yield index, check, value
+            except FutureTimeoutError:
+                for future, (index, ACTIVES, started, validated) in list(pending.items()):
+                    del pending[future]
+                    check, value = self._order_result(ACTIVES, future, started, validated, 0)
+                    yield index, check, value
+        finally:
+            # the caller stopped iterating early, forget the unread acks
+            for future in pending:
+                self.api.cancel_request(future.request_id)
+
+    def _check_order(self, price, ACTION, expirations):
+        direction = str(ACTION).lower()
+        if direction not in ("call", "put"):
+            return direction, "ACTION must be call or put"
+        if not price > 0 or not expirations > 0:
+            return direction, "price and expirations must be positive"
+        return direction, None
+
+    def _order_result(self, ACTIVES, future, started, validated, timeout):
+        handle = future.handle
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError:
+            self.api.cancel_request(future.request_id)
+            return False, "buy timed out"
+        except ConnectionError as error:
+            return False, str(error)
+        finally:
+            self.latency.record(ACTIVES, (
+                started, validated, handle.created, handle.enqueued, handle.written,
+                getattr(future, "resolved_at", None), time.perf_counter()))
+        if "error" in result:
+            return False, result["error"]
+        self._track_position(result["id"])
+        return True, result["id"]
+
+    def _track_position(self, id_number):
+        position = self.api.positions.get(id_number)
+        if position is None:
+            return
+        position.add_callback(self._on_settled)
+        self.expirations.start()
+        self.expirations.schedule(position.expires_at + self.settle_grace,
+                                  self._check_settlement, position)
+
+    def _on_settled(self, position):
+        with self._pnl_lock:
+            if position.profit is None:
+                self.pnl["abandoned"] += 1
+                return
+            self.pnl["profit"] += position.profit
+            self.pnl[position.win] += 1
+
+    def _check_settlement(self, position):
+        if position.future.done():
+            return
+        logging.error('**warning** no close event for order %s %ss after expiration',
+                      position.id, self.settle_grace)
+        self.expirations.schedule(position.expires_at + self.settle_timeout,
+                                  self._abandon, position)
+
+    def _abandon(self, position):
+        if self.api.positions.abandon(position.id, "no close event") is not None:
+            logging.error('**error** order %s abandoned, no close event', position.id)
+
+    def on_expiry(self, id_number, callback, delay=0):
+        """Call ``callback(position)`` ``delay`` seconds after an option expires.
+
+        Runs on the timer wheel thread, one thread serves every option, so
+        the callback must not block.
+
+        :returns: The :class:`Timer <quotexapi.timer_wheel.Timer>` or None
+            when the order id is unknown.
+        """
+        position = self.api.positions.get(id_number)
+        if position is None:
+            return None
+        self.expirations.start()
+        return self.expirations.schedule(position.expires_at + delay, callback, position)
+
+    def get_pnl(self):
+        """Return the profit and the win/loose/equal/abandoned counts of the settled options."""
+        with self._pnl_lock:
+            return dict(self.pnl, open=len(self.api.positions))
+
+    def get_latency_stats(self, ACTIVES=None):
+        """Export the buy latency histograms.
+
+        Stages: validate, serialize (building the request), enqueue (handing
+        it to the writer thread), write (waiting for and writing the
+        socket), ack (until the ``s_orders/open`` reply was read), deliver
+        (until buy returned) and total.
+
+        :returns: Dict of {active: {stage: histogram}} in milliseconds.
+        """
+        return self.latency.export(ACTIVES)
+
+    def reset_latency_stats(self, ACTIVES=None):
+        """Reset the buy latency histograms of one or every active."""
+        self.latency.reset(ACTIVES)
       
     def sell_option(self, options_ids):
         pass
       
-    def check_win(self, id_number):
-        """Check win based id""""
-        pass
+    def check_win(self, id_number, timeout=None):
+        """Wait for the result of an option.
+
+        The result is pushed by the server close event, nothing is polled.
+
+        :param id_number: The order id returned by :meth:`buy`.
+        :param float timeout: Seconds to wait, None waits for the expiration.
+        :returns: Tuple of ("win", "loose" or "equal", profit), or
+            (None, reason) when unknown, timed out or disconnected.
+        """
+        position = self.api.positions.get(id_number)
+        if position is None:
+            return None, "unknown order id"
+        try:
+            position.wait(timeout)
+        except (FutureTimeoutError, TimeoutError) as error:
+            return None, str(error) or "check_win timed out"
+        except ConnectionError as error:
+            return None, str(error)
+        return position.win, position.profit
+
+    def on_position_close(self, id_number, callback):
+        """Call ``callback(position)`` when an option closes, from the websocket thread.
+
+        :returns: False when the order id is unknown.
+        """
+        position = self.api.positions.get(id_number)
+        if position is None:
+            return False
+        position.add_callback(callback)
+        return True
+
+    def get_position(self, id_number):
+        """Return the :class:`Position <quotexapi.positions.Position>` of an order id.
+
+        The position is awaitable: ``deal = await quotex.get_position(id)``.
+        """
+        return self.api.positions.get(id_number)
+
+    def get_open_positions(self):
+        """Return the open positions, soonest expiration first."""
+        return self.api.positions.open_positions()
       
-    def get_signal_data(self):
-      """ Get signal Quotex server""""
-        pass
+    def get_signal_data(self, timeout=0):
+        """Get the trading signals received since the last call.
+
+        Signals are coalesced per active, a slow caller only gets the newest
+        signal of each active, see :meth:`get_stream_stats`.
+
+        :param float timeout: Seconds to wait for a signal, None waits forever.
+        :returns: Dict of active to its newest signal.
+        """
+        if not self.subscribe_signals:
+            self.subscribe_signals = True
+            self.api.subscribe_signals()
+        return self.api.signal_updates.drain(timeout)
       
-    def get_payment(self)
-        """ payment Quotex server""""
-        pass
+    def get_payment(self):
+        """Get the payout of every instrument.
+
+        :returns: Dict of active name to {"id", "payout", "open", "otc"}.
+        """
+        return {instrument.name: {"id": instrument.id, "payout": instrument.payout,
+                                  "open": instrument.trading_at(), "otc": instrument.otc}
+                for instrument in self.instruments}
+
+    def get_instrument(self, ACTIVES):
+        """Return the :class:`Instrument <quotexapi.instruments.Instrument>` of a name or id."""
+        return self.instruments.get(ACTIVES)
+
+    def check_asset_open(self, ACTIVES):
+        """Return True when the active can be traded now."""
+        instrument = self.instruments.get(ACTIVES)
+        return instrument is not None and instrument.trading_at()
+
+    def refresh_instruments(self, timeout=30):
+        """Request the instrument list and wait for the catalog refresh.
+
+        :returns: True when refreshed, False on timeout.
+        """
+        version = self.instruments.version
+        self.api.get_instruments()
+        return self.instruments.wait_update(version, timeout)
 
       
       
@@ -79,33 +346,129 @@ class Quotex:
     # _______________________        CANDLE      _____________________________
     # ________________________self.api.getcandles() wss________________________
     def get_candles(self, ACTIVES, interval, offset, period):
-        while True:
+        """Get historical candles.
+
+        The range is split into chunks of ``candles_chunk`` candles that are
+        requested together over the connection. Chunks that lie entirely in
+        the past and came back with every candle are kept in the on-disk
+        :class:`CandleCache <quotexapi.history.CandleCache>` and read from
+        there next time.
+
+        :param str ACTIVES: The active name.
+        :param int interval: The candle size in seconds.
+        :param offset: Unix time of the last requested candle, None for now.
+        :param int period: Seconds of history before ``offset``.
+        :returns: List of candle dicts ordered by time.
+        """
+        end = int(offset if offset is not None else time.time())
+        start = end - int(period)
+        chunks = {}
+        missing = []
+        for chunk in history.split_range(interval, start, end, self.candles_chunk):
+            columns = self.candles_cache.load(ACTIVES, interval, *chunk) if self.candles_cache else None
+            if columns is None:
+                missing.append(chunk)
+            else:
+                chunks[chunk] = history.candles_from_columns(columns)
+        for attempt in range(self.candles_retries + 1):
             try:
-                pass
-            except:
+                self._fetch_candle_chunks(ACTIVES, interval, missing, chunks)
+                break
+            except (ConnectionError, FutureTimeoutError):
+                # the chunks loaded before the failure are kept, retry the rest
+                missing = [chunk for chunk in missing if chunk not in chunks]
+                if attempt == self.candles_retries:
+                    logging.error('**error** get_candles can not load candles')
+                    return False
                 logging.error('**error** get_candles need reconnect')
-                self.connect() #go connect
-                
-    def get_candle_v2(self, ACTIVES, offset):
-        while True:
-            try:
-                pass
-            except:
-                logging.error('**error** get_candle_v2 need reconnect')
-                self.connect() #go connect
+                self.reconnect() #go connect
+        candles = []
+        for chunk in sorted(chunks):
+            candles.extend(candle for candle in chunks[chunk] if start <= candle["from"] <= end)
+        return candles
+
+    def _fetch_candle_chunks(self, ACTIVES, interval, chunks, result):
+        """Request up to ``candles_parallel`` chunks at a time and cache the closed ones.
+
+        Every loaded chunk is added to the ``result`` dict right away, so it
+        holds the chunks loaded before a timeout or a ConnectionError.
+        """
+        for begin in range(0, len(chunks), self.candles_parallel):
+            window = chunks[begin:begin + self.candles_parallel]
+            futures = [(chunk, self.api.get_candles(ACTIVES, interval, chunk[1], chunk[1] - chunk[0]))
+                       for chunk in window]
+            for position, (chunk, future) in enumerate(futures):
+                try:
+                    message = future.result(self.candles_timeout)
+                except (ConnectionError, FutureTimeoutError):
+                    for _, pending in futures[position:]:
+                        self.api.cancel_request(pending.request_id)
+                    raise
+                candles = [candle_from_row(row) for row in message.get("candles", [])]
+                result[chunk] = candles
+                if self.candles_cache and "error" not in message and \
+                        history.is_closed(chunk[1], interval) and \
+                        history.is_complete(candles, chunk[0], chunk[1], interval):
+                    self.candles_cache.store(ACTIVES, interval, chunk[0], chunk[1],
+                                             history.columns_from_candles(candles))
+        return result
+
+    def backtest(self, strategy, interval, period, expirations, actives=None):
+        """Backtest a strategy on the history of every instrument.
+
+        See :mod:`quotexapi.backtest`. Actives default to every instrument
+        of the catalog and each uses its own payout when known.
+
+        :param strategy: Function of the candle columns returning the signals.
+        :param int interval: The candle size in seconds.
+        :param int period: Seconds of history.
+        :param expirations: Expirations in seconds.
+        :param actives: Active names, defaults to the whole catalog.
+        :returns: Dict of {active: {expiration: stats}}; the actives whose
+            history could not be loaded are left out and logged.
+        """
+        from quotexapi import backtest  # pylint: disable=import-outside-toplevel
+        if actives is None:
+            actives = [instrument.name for instrument in self.instruments]
+        candles = {}
+        payout = {}
+        for ACTIVES in actives:
+            candles_of_active = self.get_candles(ACTIVES, interval, None, period)
+            if not candles_of_active:
+                logging.error('**warning** backtest() can not load the candles of %s', ACTIVES)
+                continue
+            candles[ACTIVES] = candles_of_active
+            instrument = self.instruments.get(ACTIVES)
+            if instrument is not None and instrument.payout:
+                payout[ACTIVES] = instrument.payout / 100.0
+        return backtest.backtest(candles, strategy, expirations, payout)
+
     # ------------------------Subscribe ONE SIZE-----------------------
     def start_candles_one_stream(self, ACTIVE, size):
-        pass
+        if [ACTIVE, size] not in self.subscribe_candle:
+            self.subscribe_candle.append([ACTIVE, size])
+        self.api.subscribe_candles(ACTIVE, size)
+
     def stop_candles_one_stream(self, ACTIVE, size):
-        pass
+        if [ACTIVE, size] in self.subscribe_candle:
+            self.subscribe_candle.remove([ACTIVE, size])
+        self.api.unsubscribe_candles(ACTIVE, size)
     
       
     # ------------------------Subscribe ALL SIZE-----------------------
 
+    # only the finest size is streamed, CandleAggregator builds the others
+
     def start_candles_all_size_stream(self, ACTIVE):
-        pass
+        if ACTIVE not in self.subscribe_candle_all_size:
+            self.subscribe_candle_all_size.append(ACTIVE)
+        self.api.subscribe_candles(ACTIVE, self.size[0])
+
     def stop_candles_all_size_stream(self, ACTIVE):
-        pass
+        if ACTIVE in self.subscribe_candle_all_size:
+            self.subscribe_candle_all_size.remove(ACTIVE)
+        if [ACTIVE, self.size[0]] not in self.subscribe_candle:
+            self.api.unsubscribe_candles(ACTIVE, self.size[0])
       
       
       
@@ -118,71 +481,274 @@ class Quotex:
 
         if size == "all":
             for s in self.size:
-                pass
+                self.api.real_time_candles[ACTIVE][s] = CandleRingBuffer(maxdict)
+                self.indicators.attach(ACTIVE, s, self.api.real_time_candles[ACTIVE][s])
+            self.api.candle_aggregators[ACTIVE] = CandleAggregator(
+                dict(self.api.real_time_candles[ACTIVE]))
+            self.start_candles_all_size_stream(ACTIVE)
         elif size in self.size:
-            pass
+            self.api.real_time_candles[ACTIVE][size] = CandleRingBuffer(maxdict)
+            self.indicators.attach(ACTIVE, size, self.api.real_time_candles[ACTIVE][size])
+            self.start_candles_one_stream(ACTIVE, size)
         else:
             logging.error('**error** start_candles_stream please input right size')
             
-     def stop_candles_stream(self, ACTIVE, size):
+    def stop_candles_stream(self, ACTIVE, size):
         if size == "all":
-            pass
+            self.stop_candles_all_size_stream(ACTIVE)
+            aggregator = self.api.candle_aggregators.pop(ACTIVE, None)
+            # the buffers of the one size streams still subscribed are kept
+            streamed = [s for A, s in self.subscribe_candle if A == ACTIVE]
+            buffers = self.api.real_time_candles.get(ACTIVE, {})
+            if aggregator is not None:
+                for s, buffer in aggregator.buffers.items():
+                    if s not in streamed and buffers.get(s) is buffer:
+                        del buffers[s]
+            if not buffers:
+                self.api.real_time_candles.pop(ACTIVE, None)
         elif size in self.size:
-            pass
+            self.stop_candles_one_stream(ACTIVE, size)
+            self.api.real_time_candles[ACTIVE].pop(size, None)
         else:
             logging.error('**error** start_candles_stream please input right size')
             
-    def get_realtime_candles(self, ACTIVE, size):
+    def get_realtime_candles(self, ACTIVE, size, as_array=False, copy=False):
+        """Get the realtime candles of a stream.
+
+        :param bool as_array: Return ``(version, array)`` from
+            :meth:`CandleRingBuffer.snapshot
+            <quotexapi.ws.objects.candles.CandleRingBuffer.snapshot>`, a
+            read-only structured NumPy array over the live buffer, instead
+            of the ``{from: candle dict}`` shape.
+        :param bool copy: With ``as_array``, copy the rows out of the buffer.
+        """
+        if as_array:
+            read = lambda buffer: buffer.snapshot(copy)
+        else:
+            read = lambda buffer: buffer.to_dict()
         if size == "all":
             try:
-                pass
-            except:
+                return {s: read(buffer)
+                        for s, buffer in self.api.real_time_candles[ACTIVE].items()}
+            except KeyError:
                 logging.error('**error** get_realtime_candles() size="all" can not get candle')
                 return False
         elif size in self.size:
             try:
-                pass
-            except:
+                return read(self.api.real_time_candles[ACTIVE][size])
+            except KeyError:
                 logging.error('**error** get_realtime_candles() size=' + str(size) + ' can not get candle')
                 return False
         else:
             logging.error('**error** get_realtime_candles() please input right "size"')
             
             
+    # ------------------------INDICATORS------------------------------
+    def add_indicator(self, ACTIVE, size, name, indicator):
+        """Register an indicator from :mod:`quotexapi.indicators` on a realtime stream.
+
+        Example: ``add_indicator("EURUSD", 60, "rsi", RSI(14))``. The
+        indicator is warmed up with the candles already buffered.
+        """
+        buffer = self.api.real_time_candles.get(ACTIVE, {}).get(size)
+        return self.indicators.add(ACTIVE, size, name, indicator, buffer)
+
+    def remove_indicator(self, ACTIVE, size, name):
+        self.indicators.remove(ACTIVE, size, name)
+
+    def get_indicators(self, ACTIVE, size):
+        """Return {name: value} of the indicators of a realtime stream."""
+        return self.indicators.values(ACTIVE, size)
+
+    # ------------------------Subscribe MOOD--------------------------
+    def start_mood_stream(self, ACTIVES):
+        if ACTIVES not in self.subscribe_mood:
+            self.subscribe_mood.append(ACTIVES)
+        self.api.subscribe_mood(ACTIVES)
+
+    def stop_mood_stream(self, ACTIVES):
+        if ACTIVES in self.subscribe_mood:
+            self.subscribe_mood.remove(ACTIVES)
+        self.api.unsubscribe_mood(ACTIVES)
+
+    def get_traders_mood(self, ACTIVES):
+        """Return the newest traders mood of an active without consuming it."""
+        return self.api.mood_updates.latest(ACTIVES)
+
+    def get_mood_updates(self, timeout=0):
+        """Get the traders mood updates received since the last call.
+
+        :param float timeout: Seconds to wait for an update, None waits forever.
+        :returns: Dict of active to its newest mood.
+        """
+        return self.api.mood_updates.drain(timeout)
+
+    def get_stream_stats(self):
+        """Return pending, dropped and lag counters of the mood and signal streams."""
+        return {"mood": self.api.mood_updates.stats(),
+                "signals": self.api.signal_updates.stats()}
+
     def re_subscribe_stream(self):
-        try:
-            pass
-        except:
-            pass
+        for ACTIVE, size in self.subscribe_candle:
+            self.api.subscribe_candles(ACTIVE, size)
+        for ACTIVE in self.subscribe_candle_all_size:
+            self.api.subscribe_candles(ACTIVE, self.size[0])
+        for ACTIVES in self.subscribe_mood:
+            self.api.subscribe_mood(ACTIVES)
+        if self.subscribe_signals:
+            self.api.subscribe_signals()
         
       
       
     def connect(self):
-        try:
-            self.api.close()
-        except:
-            pass
-            # logging.error('**warning** self.api.close() fail')
-        self.api = QuotexAPI("quotex.market", self.set_ssid)
-        check = None
-        check, reason = self.api.connect()
-        if check == True:
-            self.re_subscribe_stream()
-            return True, None
-        else:
-            return False, reason
+        """Open a new session, replacing the current one.
+
+        The closed session stays in ``self.api`` until the new one is
+        connected, so the calls of other threads meanwhile fail with a
+        reason instead of finding no api.
+
+        :returns: Tuple of (connected, reason).
+        """
+        with self._reconnect_lock:
+            self._closing = False
+            old_api = self.api
+            try:
+                old_api.close()
+            except:
+                pass
+                # logging.error('**warning** self.api.close() fail')
+            api = QuotexAPI(self.host, self.set_ssid, wss_url=self.wss_url)
+            if old_api is not None:
+                # keep the realtime candle buffers across reconnects
+                api.real_time_candles = old_api.real_time_candles
+                api.candle_aggregators = old_api.candle_aggregators
+                api.mood_updates = old_api.mood_updates
+                api.signal_updates = old_api.signal_updates
+                api.positions = old_api.positions
+                api.frame_recorder = old_api.frame_recorder
+                api.rtt = old_api.rtt
+            api.instruments = self.instruments
+            check, reason = api.connect()
+            self.api = api
+            if check == True:
+                # refreshed in the background, the cached catalog is usable meanwhile
+                self.api.get_instruments()
+                self.re_subscribe_stream()
+                self._start_watchdog(self.api)
+                return True, None
+            else:
+                return False, reason
+
+    def reconnect(self):
+        """Reconnect with jittered exponential backoff and replay subscriptions.
+
+        :returns: Tuple of (connected, reason) of the last attempt.
+        """
+        with self._reconnect_lock:
+            if self.check_connect() and not self.api.state.closed_event.is_set():
+                return True, None
+            closed_at = getattr(getattr(self.api, "state", None), "closed_at", None)
+            started = time.time()
+            down_since = closed_at or started
+            attempt = 0
+            check, reason = False, None
+            while not self._closing:
+                attempt += 1
+                check, reason = self.connect()
+                if check:
+                    break
+                if self.reconnect_max_attempts is not None and attempt >= self.reconnect_max_attempts:
+                    break
+                delay = min(self.reconnect_max_delay,
+                            self.reconnect_base_delay * 2 ** (attempt - 1))
+                delay = random.uniform(0, delay)
+                logging.error('**warning** reconnect attempt %d failed (%s), retry in %.2fs',
+                              attempt, reason, delay)
+                time.sleep(delay)
+            recovered = time.time()
+            downtime = recovered - down_since
+            self.reconnect_history.append({
+                "closed_at": down_since,
+                "recovered_at": recovered if check else None,
+                "attempts": attempt,
+                "time_to_recover": downtime if check else None,
+                "reason": reason,
+                # candles of each replayed stream that closed while offline
+                "missed_candles": {
+                    (ACTIVE, size): int(downtime // size)
+                    for ACTIVE, size in self._streamed_sizes()},
+            })
+            return check, reason
+
+    def get_reconnect_stats(self):
+        """Return the downtime records of the last reconnects."""
+        return list(self.reconnect_history)
+
+    def _streamed_sizes(self):
+        for ACTIVE, size in self.subscribe_candle:
+            yield ACTIVE, size
+        for ACTIVE in self.subscribe_candle_all_size:
+            for size in self.size:
+                yield ACTIVE, size
+
+    def _start_watchdog(self, api):
+        def watch():
+            api.state.closed_event.wait()
+            # a connect() in progress closed this session on purpose, it holds
+            # the lock until its own session replaced this one
+            with self._reconnect_lock:
+                lost = self.api is api and self.auto_reconnect and not self._closing
+            if lost:
+                logging.error('**warning** websocket closed, reconnecting')
+                self.reconnect()
+        thread = threading.Thread(target=watch, name="quotex-watchdog")
+        thread.daemon = True
+        thread.start()
           
+    def get_rtt(self):
+        """Get the network round trip time, see :meth:`QuotexAPI.get_rtt
+        <quotexapi.api.QuotexAPI.get_rtt>`."""
+        return self.api.get_rtt()
+
+    def start_capture(self, path):
+        """Record every inbound websocket frame to ``path``, see
+        :meth:`WebsocketClient.start_capture <quotexapi.ws.client.WebsocketClient.start_capture>`."""
+        return self.api.websocket_client.start_capture(path)
+
+    def stop_capture(self):
+        """Stop recording the inbound websocket frames."""
+        self.api.websocket_client.stop_capture()
+
     def close(self):
+        self._closing = True
+        self.expirations.stop()
         try:
             self.api.close()
         except:
             pass
+        # no close event can come any more, resolve the waiting check_win
+        positions = getattr(self.api, "positions", None)
+        if positions is not None:
+            positions.fail("closed")
+        # a closed recorder must not be handed to the api of the next connect
+        recorder = getattr(self.api, "frame_recorder", None)
+        if recorder is not None:
+            websocket_client = getattr(self.api, "websocket_client", None)
+            if websocket_client is not None:
+                websocket_client.stop_capture()
+            else:
+                self.api.frame_recorder = None
+                recorder.close()
           
     def check_connect(self):
         # True/False
         # if not connected, sometimes it's None, sometimes its '0', so
         # both will fall on this first case
-        if not global_value.check_websocket_if_connect:
+        try:
+            connected = self.api.state.check_websocket_if_connect
+        except AttributeError:
+            return False
+        if not connected:
             return False
         else:
             return True
@@ -0,0 +1,46 @@
+"""Module for Quotex per-connection state."""
+import threading
+import time
+
+
+class SessionState(object):
+    """Class for the state of one Quotex connection.
+
+    Every :class:`QuotexAPI <quotexapi.api.QuotexAPI>` owns its own
+    instance, so several sessions can live in one process.
+    """
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+
+    def __init__(self, ssid=None):
+        """
+        :param str ssid: The session identifier.
+        """
+        self.SSID = ssid  # pylint: disable=invalid-name
+        # None before the first open, 1 while open and 0 once closed
+        self.check_websocket_if_connect = None
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+        self.balance_id = None
+        # time of the last close or error and an event waiters can block on
+        self.closed_at = None
+        self.closed_event = threading.Event()
+        # set on open, close or error
+        self.websocket_event = threading.Event()
+        # set when the server accepts or rejects the ssid
+        self.authorization_event = threading.Event()
+        self.authorization_accepted = None
+
+    def reset(self):
+        """Reset the connection flags before a new websocket is opened."""
+        self.check_websocket_if_connect = None
+        self.check_websocket_if_error = False
+        self.websocket_error_reason = None
+        self.closed_at = None
+        self.websocket_event.clear()
+        self.closed_event.clear()
+
+    def mark_closed(self):
+        """Record that the websocket closed or failed."""
+        if self.closed_at is None:
+            self.closed_at = time.time()
+        self.closed_event.set()
@@ -0,0 +1,143 @@
+"""Module for parameter sweeps of backtests across a process pool.
+
+The candles of every active are copied once into one shared memory block
+that every worker maps read-only, only the parameters travel per task::
+
+    def momentum(columns, lookback):
+        close = columns["close"]
+        signals = numpy.zeros(len(close))
+        signals[lookback:] = numpy.sign(close[lookback:] - close[:-lookback])
+        return signals
+
+    table = sweep(candles, momentum, {"lookback": range(1, 50)}, [60, 300])
+
+The strategy must be a module level function so it can be pickled.
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from quotexapi.backtest import candle_columns, evaluate
+from quotexapi.ws.objects.candles import FIELDS
+
+# set in every worker by _attach
+_SHARED = {}
+
+
+def parameter_grid(grid):
+    """Expand ``{"name": [values]}`` to the list of every combination.
+
+    A list of dicts is returned unchanged.
+    """
+    if not isinstance(grid, dict):
+        return [dict(params) for params in grid]
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _open_shared(name):
+    from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before Python 3.13 the attach is registered with the resource
+        # tracker the workers share with the parent, which unlinks it once
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(name, layout, strategy, expirations, payout):
+    import numpy  # pylint: disable=import-outside-toplevel
+    memory = _open_shared(name)
+    block = numpy.ndarray((memory.size // 8,), dtype=numpy.float64, buffer=memory.buf)
+    block.flags.writeable = False
+    columns = {}
+    for active, offset, count in layout:
+        columns[active] = {field: block[offset + index * count:offset + (index + 1) * count]
+                           for index, field in enumerate(FIELDS)}
+    _SHARED.update(memory=memory, columns=columns, strategy=strategy,
+                   expirations=expirations, payout=payout)
+
+
+def _run_chunk(chunk):
+    rows = []
+    strategy = _SHARED["strategy"]
+    payout = _SHARED["payout"]
+    for number, params in chunk:
+        totals = {}
+        for active, columns in _SHARED["columns"].items():
+            ratio = payout.get(active, 0.8) if isinstance(payout, dict) else payout
+            report = evaluate(columns, strategy(columns, **params), _SHARED["expirations"], ratio)
+            for expiration, stats in report.items():
+                total = totals.setdefault(expiration, {
+                    "trades": 0, "wins": 0, "losses": 0, "return": 0.0, "max_drawdown": 0.0})
+                for key in ("trades", "wins", "losses", "return"):
+                    total[key] += stats[key]
+                total["max_drawdown"] = max(total["max_drawdown"], stats["max_drawdown"])
+        for expiration, total in totals.items():
+            trades = total["trades"]
+            total.update(number=number, params=params, expiration=expiration,
+                         win_rate=total["wins"] / trades if trades else None,
+                         return_per_trade=total["return"] / trades if trades else None)
+            rows.append(total)
+    return rows
+
+
+def sweep(candles_by_active, strategy, grid, expirations, payout=0.8, workers=None,
+          rank_by="return", chunk_size=None, callback=None, start_method=None):
+    """Backtest every parameter combination on every active and expiration.
+
+    :param dict candles_by_active: Active name to candles accepted by
+        :func:`candle_columns <quotexapi.backtest.candle_columns>`.
+    :param strategy: Module level function ``strategy(columns, **params)``
+        returning the signals.
+    :param grid: Dict of parameter name to values, or list of parameter dicts.
+    :param expirations: Expirations in seconds.
+    :param payout: Profit ratio of a won option, or dict of active to ratio.
+    :param int workers: Worker processes, defaults to the core count.
+    :param str rank_by: Row key the table is sorted on, highest first.
+    :param int chunk_size: Parameter sets per task.
+    :param callback: Called with the rows of every finished task.
+    :param str start_method: The multiprocessing start method.
+    :returns: List of rows, one per (params, expiration), with trades, wins,
+        losses, win_rate, return and return_per_trade summed over the
+        actives and the worst per active max_drawdown.
+    """
+    import numpy  # pylint: disable=import-outside-toplevel
+    from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+    params_list = parameter_grid(grid)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(64, len(params_list) // (workers * 4) or 1))
+    columns = {active: candle_columns(candles) for active, candles in candles_by_active.items()}
+    layout = []
+    offset = 0
+    for active, active_columns in columns.items():
+        count = len(active_columns["time"])
+        layout.append((active, offset, count))
+        offset += count * len(FIELDS)
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1) * 8)
+    try:
+        block = numpy.ndarray((offset,), dtype=numpy.float64, buffer=memory.buf)
+        for active, start, count in layout:
+            for index, field in enumerate(FIELDS):
+                block[start + index * count:start + (index + 1) * count] = columns[active][field]
+        del block
+        numbered = list(enumerate(params_list))
+        chunks = [numbered[start:start + chunk_size]
+                  for start in range(0, len(numbered), chunk_size)]
+        rows = []
+        with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context(start_method),
+                initializer=_attach,
+                initargs=(memory.name, layout, strategy, list(expirations), payout)) as executor:
+            for future in as_completed([executor.submit(_run_chunk, chunk) for chunk in chunks]):
+                chunk_rows = future.result()
+                rows.extend(chunk_rows)
+                if callback is not None:
+                    callback(chunk_rows)
+    finally:
+        memory.close()
+        memory.unlink()
+    rows.sort(key=lambda row: (row[rank_by] is not None, row[rank_by], -row["number"]),
+              reverse=True)
+    return rows
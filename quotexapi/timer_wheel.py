@@ -0,0 +1,157 @@
+"""Module for a hierarchical timer wheel driving option expirations."""
+import logging
+import math
+import threading
+import time
+
+
+class Timer(object):
+    """Class for one scheduled callback of :class:`TimerWheel`."""
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("when", "tick", "callback", "args", "cancelled")
+
+    def __init__(self, when, tick, callback, args):
+        self.when = when
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Cancel the timer, it is dropped when its slot comes up."""
+        self.cancelled = True
+
+
+class TimerWheel(object):
+    """Class for a hierarchical timer wheel.
+
+    Level 0 has one slot per tick, every upper level one slot per full turn
+    of the level below. Scheduling and cancelling are O(1); a timer moves
+    down at most once per level, when its upper slot comes up, so every
+    tick costs O(1) plus the timers it fires. One thread serves every timer.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tick=0.1, slots=(256, 64, 64, 64)):
+        """
+        :param float tick: Seconds per tick, the resolution of the timers.
+        :param slots: Number of slots of every level. With the defaults the
+            levels span 25.6 s, 27 min, 29 h and 77 days.
+        """
+        self.tick = tick
+        self.slots = slots
+        # ticks covered by one slot of every level
+        self.spans = [1]
+        for size in slots[:-1]:
+            self.spans.append(self.spans[-1] * size)
+        self._levels = [[[] for _ in range(size)] for size in slots]
+        self._overflow = []
+        self._current = int(time.time() / tick)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, when, callback, *args):
+        """Call ``callback(*args)`` at unix time ``when`` (at most one tick late).
+
+        :returns: The :class:`Timer`, to cancel it.
+        """
+        timer = Timer(when, int(math.ceil(when / self.tick)), callback, args)
+        with self._lock:
+            self._insert(timer)
+            self._count += 1
+        return timer
+
+    def call_later(self, delay, callback, *args):
+        """Call ``callback(*args)`` in ``delay`` seconds."""
+        return self.schedule(time.time() + delay, callback, *args)
+
+    def advance(self, now=None):
+        """Fire every timer due at ``now``.
+
+        :returns: Number of callbacks fired.
+        """
+        target = int((now if now is not None else time.time()) / self.tick)
+        due = []
+        with self._lock:
+            if not self._count:
+                self._current = max(self._current, target)
+            while self._current < target:
+                self._current += 1
+                self._cascade()
+                slot = self._levels[0][self._current % self.slots[0]]
+                if slot:
+                    self._levels[0][self._current % self.slots[0]] = []
+                    self._count -= len(slot)
+                    due.extend(timer for timer in slot if not timer.cancelled)
+                if not self._count:
+                    self._current = target
+        logger = logging.getLogger(__name__)
+        for timer in due:
+            try:
+                timer.callback(*timer.args)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("timer callback failed")
+        return len(due)
+
+    def start(self):
+        """Start the thread advancing the wheel every tick, if not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="quotex-timer-wheel")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the wheel thread, pending timers are kept."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.advance()
+            next_tick = (self._current + 1) * self.tick
+            self._stop.wait(max(next_tick - time.time(), 0.0))
+
+    def _insert(self, timer, cascading=False):
+        delta = timer.tick - self._current
+        if delta == 0 and cascading:
+            # due now, the slot of this tick is fired right after the cascade
+            self._levels[0][self._current % self.slots[0]].append(timer)
+            return
+        if delta <= 0:
+            # already due, fire on the next tick
+            self._levels[0][(self._current + 1) % self.slots[0]].append(timer)
+            return
+        for level, size in enumerate(self.slots):
+            if delta < self.spans[level] * size:
+                self._levels[level][(timer.tick // self.spans[level]) % size].append(timer)
+                return
+        self._overflow.append(timer)
+
+    def _cascade(self):
+        # move down the timers of every upper slot starting at this tick,
+        # upper levels first so their timers can move down again right away
+        for level in range(len(self.slots) - 1, 0, -1):
+            span = self.spans[level]
+            if self._current % span:
+                continue
+            index = (self._current // span) % self.slots[level]
+            timers, self._levels[level][index] = self._levels[level][index], []
+            if level == len(self.slots) - 1 and index == 0:
+                timers.extend(self._overflow)
+                self._overflow = []
+            for timer in timers:
+                if timer.cancelled:
+                    self._count -= 1
+                else:
+                    self._insert(timer, cascading=True)
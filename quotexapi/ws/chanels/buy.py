@@ -0,0 +1,34 @@
+"""Module for Quotex buy websocket chanel."""
+import json
+
+from quotexapi.ws.chanels.base import Base
+
+
+class Buy(Base):
+    """Class for Quotex buy websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "orders/open"
+
+    def __call__(self, price, active, direction, duration, request_id, is_demo=1):
+        """Method to send message to buy websocket chanel.
+
+        :param price: The buying price.
+        :param str active: The buying active name.
+        :param str direction: The buying direction, "call" or "put".
+        :param int duration: The expiration time in seconds.
+        :param int request_id: The client side id echoed back by the server.
+        :param int is_demo: 1 for the practice account, 0 for the real one.
+        """
+        payload = {
+            "asset": active,
+            "amount": price,
+            "time": duration,
+            "action": direction,
+            "isDemo": is_demo,
+            "tournamentId": 0,
+            "requestId": request_id,
+            "optionType": 100
+        }
+        data = '42["{}",{}]'.format(self.name, json.dumps(payload))
+        return self.send_websocket_request(data)
@@ -0,0 +1,30 @@
+"""Module for Quotex candles websocket chanel."""
+import json
+
+from quotexapi.ws.chanels.base import Base
+
+
+class GetCandles(Base):
+    """Class for Quotex candles websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "history/load/line"
+
+    def __call__(self, active, size, end_time, offset, index):
+        """Method to send message to candles websocket chanel.
+
+        :param str active: The active name.
+        :param int size: The candle size in seconds.
+        :param int end_time: Unix time of the last requested candle.
+        :param int offset: Seconds of history before ``end_time``.
+        :param int index: The client side id echoed back by the server.
+        """
+        payload = {
+            "asset": active,
+            "index": index,
+            "time": end_time,
+            "offset": offset,
+            "period": size
+        }
+        data = '42["{}",{}]'.format(self.name, json.dumps(payload))
+        return self.send_websocket_request(data)
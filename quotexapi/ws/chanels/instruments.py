@@ -0,0 +1,15 @@
+"""Module for Quotex instruments websocket chanel."""
+
+from quotexapi.ws.chanels.base import Base
+
+
+class GetInstruments(Base):
+    """Class for Quotex instruments list websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "instruments/list"
+
+    def __call__(self):
+        """Method to send message to instruments list websocket chanel."""
+        data = '42["{}"]'.format(self.name)
+        return self.send_websocket_request(data)
@@ -0,0 +1,21 @@
+"""Module for Quotex websocket ssid chanel."""
+import json
+
+from quotexapi.ws.chanels.base import Base
+
+
+class Ssid(Base):
+    """Class for Quotex websocket ssid chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "authorization"
+
+    def __call__(self, ssid, is_demo=1):
+        """Method to send message to ssid websocket chanel.
+
+        :param str ssid: The session identifier.
+        :param int is_demo: 1 for the practice account, 0 for the real one.
+        """
+        payload = {"session": ssid, "isDemo": is_demo, "tournamentId": 0}
+        data = '42["{}",{}]'.format(self.name, json.dumps(payload))
+        return self.send_websocket_request(data)
@@ -0,0 +1,78 @@
+"""Module for Quotex subscribe websocket chanels."""
+import json
+
+from quotexapi.ws.chanels.base import Base
+
+
+class SubscribeCandles(Base):
+    """Class for Quotex candles subscribe websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "instruments/update"
+
+    def __call__(self, active, size):
+        """Method to send message to candles subscribe websocket chanel.
+
+        :param str active: The active name.
+        :param int size: The candle size in seconds.
+        """
+        data = '42["{}",{}]'.format(self.name, json.dumps({"asset": active, "period": size}))
+        return self.send_websocket_request(data)
+
+
+class UnsubscribeCandles(Base):
+    """Class for Quotex candles unsubscribe websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "instruments/unfollow"
+
+    def __call__(self, active, size):
+        """Method to send message to candles unsubscribe websocket chanel.
+
+        :param str active: The active name.
+        :param int size: The candle size in seconds.
+        """
+        data = '42["{}",{}]'.format(self.name, json.dumps({"asset": active, "period": size}))
+        return self.send_websocket_request(data)
+
+
+class SubscribeMood(Base):
+    """Class for Quotex traders mood subscribe websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "mood/follow"
+
+    def __call__(self, active):
+        """Method to send message to mood subscribe websocket chanel.
+
+        :param str active: The active name.
+        """
+        data = '42["{}",{}]'.format(self.name, json.dumps(active))
+        return self.send_websocket_request(data)
+
+
+class UnsubscribeMood(Base):
+    """Class for Quotex traders mood unsubscribe websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "mood/unfollow"
+
+    def __call__(self, active):
+        """Method to send message to mood unsubscribe websocket chanel.
+
+        :param str active: The active name.
+        """
+        data = '42["{}",{}]'.format(self.name, json.dumps(active))
+        return self.send_websocket_request(data)
+
+
+class SubscribeSignals(Base):
+    """Class for Quotex trading signals subscribe websocket chanel."""
+    # pylint: disable=too-few-public-methods
+
+    name = "signal/subscribe"
+
+    def __call__(self):
+        """Method to send message to signals subscribe websocket chanel."""
+        data = '42["{}"]'.format(self.name)
+        return self.send_websocket_request(data)
@@ -1,9 +1,20 @@
 """Module for IQ option websocket."""
 
-import simplejson as json
 import logging
+import threading
+import time
 import websocket
-import quotexapi.global_value as global_value
+from quotexapi.ws.parser import FrameParser, EVENT, OPEN, PING, PONG
+from quotexapi.ws.recorder import FrameRecorder
+
+
+def _prepare_logging():
+    """Prepare the websocket-client logger, done when a connection is opened."""
+    websocket_logger = logging.getLogger("websocket")
+    websocket_logger.setLevel(logging.DEBUG)
+    websocket_logger.addHandler(logging.NullHandler())
+
+_prepare_logging()
 
 class WebsocketClient(object):
     """Class for work with Quotex API websocket."""
@@ -18,64 +29,200 @@ class WebsocketClient(object):
             self.api.wss_url, on_message=self.on_message,
             on_error=self.on_error, on_close=self.on_close,
             on_open=self.on_open)
+        self.parser = FrameParser()
+        # engine.io heartbeat, the intervals come from the open packet
+        self.ping_interval = None
+        self.ping_timeout = None
+        # seconds between pings used to measure the round trip time
+        self.probe_interval = 5.0
+        self._ping = None
+        self._ping_lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        # FrameRecorder of the capture mode, kept by the api across clients
+        self.recorder = getattr(api, "frame_recorder", None)
+        self.handlers = {
+            "s_authorization": self._on_authorization,
+            "authorization/reject": self._on_authorization_reject,
+            "s_orders/open": self._on_order_open,
+            "s_orders/close": self._on_order_close,
+            "s_history/load/line": self._on_candles,
+            "candles/update": self._on_candle_update,
+            "instruments/list": self._on_instruments,
+            "mood/update": self._on_mood,
+            "signals/update": self._on_signals,
+        }
+
+    def register(self, name, handler):
+        """Register the handler of one socket.io event.
 
-    def dict_queue_add(self,dict,maxdict,key1,key2,key3,value):
-        if key3 in dict[key1][key2]:
-                    dict[key1][key2][key3]=value
-        else:
-            while True:
-                try:
-                    dic_size=len(dict[key1][key2])
-                except:
-                    dic_size=0
-                if dic_size<maxdict:
-                    dict[key1][key2][key3]=value
-                    break
-                else:
-                    #del mini key
-                    del dict[key1][key2][sorted(dict[key1][key2].keys(), reverse=False)[0]]   
-
-    def on_message(self, message): # pylint: disable=unused-argument
+        :param str name: The event name.
+        :param handler: Callable taking the event data.
+        """
+        self.handlers[name] = handler
+
+    def start_capture(self, path):
+        """Append every inbound frame to the log ``path``.
+
+        Replay it with :class:`FrameReplayer <quotexapi.ws.recorder.FrameReplayer>`.
+        """
+        self.stop_capture()
+        self.recorder = self.api.frame_recorder = FrameRecorder(path)
+        return self.recorder
+
+    def stop_capture(self):
+        """Stop the capture mode and close its log."""
+        recorder, self.recorder = self.recorder, None
+        # the api keeps it even when a failed write dropped it here
+        recorder = recorder or self.api.frame_recorder
+        self.api.frame_recorder = None
+        if recorder is not None:
+            recorder.close()
+
+    def on_message(self, wss, message): # pylint: disable=unused-argument
         """Method to process websocket messages."""
-        global_value.ssl_Mutual_exclusion=True
-        try:
-            logger = logging.getLogger(__name__)
-            message = massage
+        logger = logging.getLogger(__name__)
+        recorder = self.recorder
+        if recorder is not None:
             try:
-                message = message[1:]
-                message = message.decode('utf-8')
-                logger.debug(message)
-                message = json.loads(str(message))
-                try:
-                     self.api.buy_id= message["id"]
-                except:
-                    pass
-            except:
-                pass
-        except:
-            pass
-        global_value.ssl_Mutual_exclusion=False
-
-
-    @staticmethod
-    def on_error(wss, error):  # pylint: disable=unused-argument
+                recorder.write(message)
+            except (ValueError, OSError):
+                # closed by stop_capture meanwhile or a failing disk, drop the
+                # capture but never tear down the socket
+                logger.warning("frame capture to %s failed", recorder.path, exc_info=True)
+                if self.recorder is recorder:
+                    self.recorder = None
+        logger.debug(message)
+        try:
+            packet = self.parser.parse(message)
+        except (ValueError, IndexError):
+            logger.error("can not parse websocket message %r", message[:200])
+            return
+        if packet is None:
+            return
+        if packet[0] == PONG:
+            self._on_pong()
+            return
+        # a replayed capture runs without a writer: no heartbeat, no reply
+        if packet[0] == OPEN:
+            if self.api.websocket_writer is not None:
+                self._on_open_packet(packet[2])
+            return
+        if packet[0] == PING:
+            if self.api.websocket_writer is not None:
+                self.api.send_websocket_request(PONG)
+            return
+        if packet[0] != EVENT:
+            return
+        handler = self.handlers.get(packet[1])
+        if handler is None:
+            return
+        try:
+            handler(packet[2])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("error in handler of %s", packet[1])
+
+    def _on_open_packet(self, data):
+        self.ping_interval = data.get("pingInterval", 25000) / 1000.0
+        self.ping_timeout = data.get("pingTimeout", 5000) / 1000.0
+        self._heartbeat_stop.clear()
+        thread = threading.Thread(target=self._heartbeat, name="quotex-heartbeat")
+        thread.daemon = True
+        thread.start()
+
+    def _heartbeat(self):
+        logger = logging.getLogger(__name__)
+        interval = min(self.ping_interval, self.probe_interval or self.ping_interval)
+        while not self._heartbeat_stop.wait(interval):
+            ping = self._ping
+            if ping is not None and time.perf_counter() - ping.created > \
+                    self.ping_interval + self.ping_timeout:
+                logger.error("no pong for %.1fs, closing the websocket",
+                             time.perf_counter() - ping.created)
+                self.wss.close()
+                return
+            if ping is None:
+                with self._ping_lock:
+                    self._ping = self.api.send_websocket_request(PING)
+
+    def _on_pong(self):
+        with self._ping_lock:
+            ping, self._ping = self._ping, None
+        if ping is not None:
+            # measured from the socket write, the writer queue is not network time
+            self.api.rtt.add(time.perf_counter() - (ping.written or ping.created))
+
+    def stop_heartbeat(self):
+        """Stop sending pings, done when the websocket closes."""
+        self._heartbeat_stop.set()
+
+    def _on_authorization(self, data):  # pylint: disable=unused-argument
+        self.api.state.authorization_accepted = True
+        self.api.state.authorization_event.set()
+
+    def _on_authorization_reject(self, data):  # pylint: disable=unused-argument
+        self.api.state.authorization_accepted = False
+        self.api.state.authorization_event.set()
+
+    def _on_order_open(self, data):
+        if "id" in data and "error" not in data:
+            self.api.positions.open(data)
+        self.api.resolve_request(data.get("requestId"), data)
+
+    def _on_order_close(self, data):
+        for deal in data.get("deals", ()):
+            self.api.positions.close(deal)
+
+    def _on_candles(self, data):
+        self.api.resolve_request(data.get("index"), data)
+
+    def _on_candle_update(self, data):
+        aggregator = self.api.candle_aggregators.get(data["asset"])
+        if aggregator is not None and data["period"] == aggregator.base_size:
+            aggregator.add_candle(data)
+            return
+        buffer = self.api.real_time_candles.get(data["asset"], {}).get(data["period"])
+        if buffer is not None:
+            buffer.add_candle(data)
+
+    def _on_instruments(self, data):
+        self.api.instruments.update(data)
+
+    def _on_mood(self, data):
+        self.api.mood_updates.publish(data["asset"], data)
+
+    def _on_signals(self, data):
+        for signal in data if isinstance(data, list) else [data]:
+            self.api.signal_updates.publish(signal["asset"], signal)
+
+    def on_error(self, wss, error):  # pylint: disable=unused-argument
         """Method to process websocket errors."""
         logger = logging.getLogger(__name__)
         logger.error(error)
-        global_value.websocket_error_reason = str(error)
-        global_value.check_websocket_if_error = True
-        
+        self.api.state.websocket_error_reason = str(error)
+        self.api.state.check_websocket_if_error = True
+        # before closed_event, on_close may come much later and the watchdog
+        # woken by closed_event must not see the session as connected
+        self.api.state.check_websocket_if_connect = 0
+        self.stop_heartbeat()
+        self.api.state.mark_closed()
+        self.api.state.websocket_event.set()
+        # wake up a pending authorization instead of letting it time out
+        self.api.state.authorization_event.set()
 
-    @staticmethod
-    def on_open(wss):  # pylint: disable=unused-argument
+    def on_open(self, wss):  # pylint: disable=unused-argument
         """Method to process websocket open."""
         logger = logging.getLogger(__name__)
         logger.debug("Websocket client connected.")
-        global_value.check_websocket_if_connect = 1
+        self.api.state.check_websocket_if_connect = 1
+        self.api.state.websocket_event.set()
 
-    @staticmethod
-    def on_close(wss):  # pylint: disable=unused-argument
+    def on_close(self, wss, *args):  # pylint: disable=unused-argument
         """Method to process websocket close."""
         logger = logging.getLogger(__name__)
         logger.debug("Websocket connection closed.")
-        global_value.check_websocket_if_connect = 0
+        self.api.state.check_websocket_if_connect = 0
+        self.stop_heartbeat()
+        self.api.state.mark_closed()
+        self.api.state.websocket_event.set()
+        self.api.state.authorization_event.set()
+        self.api.fail_requests("Websocket connection closed.")
@@ -0,0 +1,207 @@
+"""Module for Quotex realtime candles object."""
+import time
+from array import array
+from bisect import bisect_left
+
+# column order of one stored candle row
+FIELDS = ("time", "open", "high", "low", "close", "volume")
+_WIDTH = len(FIELDS)
+
+
+def candle_from_row(row):
+    """Convert a history row ``[from, open, close, max, min, volume]`` to a candle dict."""
+    return {"from": row[0], "open": row[1], "close": row[2],
+            "max": row[3], "min": row[4],
+            "volume": row[5] if len(row) > 5 else 0}
+
+
+class CandleRingBuffer(object):
+    """Class for the fixed-capacity candle store of one (active, size).
+
+    Rows are kept in one contiguous ``array('d')``. Every row is written
+    twice, ``capacity`` rows apart, so the window of the latest candles is
+    always contiguous and can be exposed to NumPy without copying, while
+    append and evict stay O(1).
+    """
+
+    def __init__(self, capacity):
+        """
+        :param int capacity: Maximum number of candles kept.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * _WIDTH * 2 * capacity))
+        self._head = 0
+        self._count = 0
+        # odd while a row is being written, see snapshot()
+        self.version = 0
+        # callables fed every stored candle, e.g. by IndicatorEngine.attach
+        self.listeners = []
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_time(self):
+        """Property to get the time of the latest candle.
+
+        :returns: The time of the latest candle or None if empty.
+        """
+        if not self._count:
+            return None
+        return self._data[(self._head + self._count - 1) * _WIDTH]
+
+    def add(self, timestamp, open, high, low, close, volume=0.0):  # pylint: disable=redefined-builtin
+        """Add a candle or update the one with the same timestamp.
+
+        :returns: False if the candle is older than the stored window.
+        """
+        last = self.last_time
+        if last is None or timestamp > last:
+            index = self._count
+        elif timestamp == last:
+            index = self._count - 1
+        else:
+            index = bisect_left(_TimeColumn(self), timestamp)
+            if index == self._count or self._data[(self._head + index) * _WIDTH] != timestamp:
+                return False
+        row = (timestamp, open, high, low, close, volume)
+        self.version += 1
+        if index == self._count:
+            if self._count == self.capacity:
+                self._head = (self._head + 1) % self.capacity
+                index -= 1
+            else:
+                self._count += 1
+        slot = (self._head + index) % self.capacity
+        start = slot * _WIDTH
+        self._data[start:start + _WIDTH] = array("d", row)
+        mirror = (slot + self.capacity) * _WIDTH
+        self._data[mirror:mirror + _WIDTH] = self._data[start:start + _WIDTH]
+        self.version += 1
+        for listener in self.listeners:
+            listener(*row)
+        return True
+
+    def add_candle(self, candle):
+        """Add a candle dict with keys from, open, close, min, max, volume."""
+        return self.add(candle["from"], candle["open"], candle["max"], candle["min"],
+                        candle["close"], candle.get("volume", 0.0))
+
+    def rows(self):
+        """Return the latest candles as a memoryview of ``len(self) * 6`` doubles."""
+        start = self._head * _WIDTH
+        return memoryview(self._data)[start:start + self._count * _WIDTH]
+
+    def as_array(self):
+        """Return a zero-copy NumPy view with one row per candle.
+
+        :returns: ``numpy.ndarray`` of shape ``(len(self), 6)`` ordered by time.
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+        return numpy.frombuffer(self.rows(), dtype=numpy.float64).reshape(-1, _WIDTH)
+
+    def snapshot(self, copy=False):
+        """Return a read-only structured NumPy array of the candles and its version.
+
+        Without ``copy`` the array is a zero-copy view of the live buffer:
+        it stays valid while ``self.version`` equals the returned version,
+        later candles may overwrite its rows. With ``copy`` the rows are
+        copied and the version is checked, so the result never changes.
+
+        :returns: Tuple of (version, ``numpy.ndarray`` with the fields
+            time, open, high, low, close and volume).
+        """
+        import numpy  # pylint: disable=import-outside-toplevel
+        dtype = numpy.dtype([(field, numpy.float64) for field in FIELDS])
+        while True:
+            version = self.version
+            if version % 2:
+                time.sleep(0)
+                continue
+            view = numpy.frombuffer(self.rows().toreadonly(), dtype=dtype)
+            if copy:
+                view = view.copy()
+                view.flags.writeable = False
+            if self.version == version:
+                return version, view
+
+    def to_dict(self):
+        """Return the candles in the ``{from: candle dict}`` shape."""
+        rows = self.rows()
+        result = {}
+        for start in range(0, len(rows), _WIDTH):
+            timestamp, open_, high, low, close, volume = rows[start:start + _WIDTH]
+            result[int(timestamp)] = {"from": int(timestamp), "open": open_, "close": close,
+                                      "min": low, "max": high, "volume": volume}
+        return result
+
+
+class _TimeColumn(object):
+    """Sequence over the stored timestamps, used for binary search."""
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, buffer):
+        self._data = buffer._data  # pylint: disable=protected-access
+        self._head = buffer._head  # pylint: disable=protected-access
+        self._count = len(buffer)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return self._data[(self._head + index) * _WIDTH]
+
+
+class CandleAggregator(object):
+    """Class that builds every coarser timeframe of one active from its finest stream.
+
+    Each base candle update is folded into the current candle of every size
+    in O(1) per size, so only the base size has to be subscribed. Coarse
+    candles start at ``from - from % size`` and only cover data received
+    since the aggregator was created.
+    """
+
+    def __init__(self, buffers):
+        """
+        :param dict buffers: Size to :class:`CandleRingBuffer`, the smallest
+            size is the streamed base.
+        """
+        self.buffers = buffers
+        self.base_size = min(buffers)
+        self._coarse = sorted(size for size in buffers if size != self.base_size)
+        # size -> [from, open, high, low, close, volume of finished base candles]
+        self._current = {}
+        self._base_from = None
+        self._base_volume = 0.0
+
+    def add_candle(self, candle):
+        """Add a base candle update (dict with from, open, close, min, max, volume)."""
+        timestamp = candle["from"]
+        volume = candle.get("volume", 0.0)
+        if not self.buffers[self.base_size].add_candle(candle):
+            return False
+        if self._base_from is not None and timestamp < self._base_from:
+            # late update of an earlier base candle, the coarse candles
+            # already hold it and would lose their open, high and low
+            return True
+        if timestamp != self._base_from:
+            finished_volume, self._base_from = self._base_volume, timestamp
+        else:
+            finished_volume = 0.0
+        self._base_volume = volume
+        for size in self._coarse:
+            start = timestamp - timestamp % size
+            current = self._current.get(size)
+            if current is None or current[0] != start:
+                current = [start, candle["open"], candle["max"], candle["min"], candle["close"], 0.0]
+                self._current[size] = current
+            else:
+                current[2] = max(current[2], candle["max"])
+                current[3] = min(current[3], candle["min"])
+                current[4] = candle["close"]
+                current[5] += finished_volume
+            self.buffers[size].add(start, current[1], current[2], current[3], current[4],
+                                   current[5] + volume)
+        return True
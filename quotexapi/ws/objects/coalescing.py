@@ -0,0 +1,104 @@
+"""Module for Quotex coalescing update channels."""
+import threading
+import time
+from collections import OrderedDict
+
+
+class CoalescingChannel(object):
+    """Class for a latest-value-per-key channel between the websocket and a consumer.
+
+    :meth:`publish` never blocks and never queues more than one value per
+    key: an update of a key the consumer has not read yet replaces the
+    pending value and counts as dropped. Memory is bounded by the number of
+    keys, however slow the consumer is.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # key -> (value, pending since) not read by the consumer yet, the
+        # time of the first unread publish so the lag covers the whole wait
+        self._pending = OrderedDict()
+        # key -> (value, published at) of the last value of every key
+        self._latest = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.dropped_by_key = {}
+        self.last_lag = None
+        self.max_lag = 0.0
+
+    def publish(self, key, value):
+        """Store the newest value of ``key``, called from the websocket thread."""
+        item = (value, time.time())
+        with self._condition:
+            self.published += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.dropped += 1
+                self.dropped_by_key[key] = self.dropped_by_key.get(key, 0) + 1
+                # only the payload is replaced, the key keeps its place and age
+                self._pending[key] = (value, pending[1])
+            else:
+                self._pending[key] = item
+                self._condition.notify()
+            self._latest[key] = item
+
+    def latest(self, key, default=None):
+        """Return the last value of ``key`` without consuming it."""
+        item = self._latest.get(key)
+        return default if item is None else item[0]
+
+    def get(self, timeout=None):
+        """Wait for the oldest pending key.
+
+        :param float timeout: Seconds to wait, None waits forever.
+        :returns: Tuple of (key, value) or None on timeout.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._pending, timeout):
+                return None
+            key, (value, pending_since) = self._pending.popitem(last=False)
+            self._delivered(1, pending_since)
+        return key, value
+
+    def drain(self, timeout=None):
+        """Consume every pending value, waiting up to ``timeout`` for the first one.
+
+        :returns: Dict of key to its newest value, empty on timeout.
+        """
+        with self._condition:
+            if timeout != 0:
+                self._condition.wait_for(lambda: self._pending, timeout)
+            pending, self._pending = self._pending, OrderedDict()
+            if pending:
+                self._delivered(len(pending), min(item[1] for item in pending.values()))
+        return {key: item[0] for key, item in pending.items()}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def stats(self):
+        """Return the counters of the channel.
+
+        ``lag`` is the time in seconds since the oldest pending key got
+        unread, the time the consumer is behind right now; ``last_lag`` and ``max_lag`` are
+        measured on delivery.
+        """
+        with self._condition:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                "pending": len(self._pending),
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": self.dropped,
+                "dropped_by_key": dict(self.dropped_by_key),
+                "lag": time.time() - oldest[1] if oldest is not None else 0.0,
+                "last_lag": self.last_lag,
+                "max_lag": self.max_lag,
+            }
+
+    def _delivered(self, count, pending_since):
+        self.delivered += count
+        self.last_lag = time.time() - pending_since
+        self.max_lag = max(self.max_lag, self.last_lag)
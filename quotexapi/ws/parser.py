@@ -0,0 +1,77 @@
+"""Module for Quotex socket.io (EIO=3) frame parser."""
+import json
+
+try:
+    import orjson as _fast_json
+except ImportError:  # pragma: no cover - optional speedup
+    _fast_json = None
+
+# engine.io packet types
+OPEN = "0"
+CLOSE = "1"
+PING = "2"
+PONG = "3"
+MESSAGE = "4"
+# socket.io packet types, carried inside an engine.io MESSAGE
+CONNECT = "40"
+DISCONNECT = "41"
+EVENT = "42"
+ACK = "43"
+ERROR = "44"
+BINARY_EVENT = "45"
+BINARY_ACK = "46"
+
+loads = _fast_json.loads if _fast_json is not None else json.loads
+
+
+def set_json_loads(func):
+    """Replace the JSON decoder used by the parser.
+
+    :param func: Callable taking ``str`` or ``bytes`` and returning the object.
+    """
+    global loads  # pylint: disable=global-statement
+    loads = func
+
+
+class FrameParser(object):
+    """Class to classify socket.io frames of one websocket connection.
+
+    Binary events arrive as a text placeholder (``451-["name",...]``)
+    followed by a binary frame, so the parser keeps the pending event name
+    between calls.
+    """
+
+    def __init__(self):
+        self.pending_event = None
+
+    def parse(self, message):
+        """Parse one websocket frame.
+
+        :param message: The raw ``str`` or ``bytes`` frame.
+        :returns: Tuple of (packet type, event name, data) or None while a
+            binary event is waiting for its payload.
+        """
+        if isinstance(message, (bytes, bytearray, memoryview)):
+            name, self.pending_event = self.pending_event, None
+            # the first byte is the engine.io MESSAGE type
+            return EVENT if name is not None else MESSAGE, name, loads(bytes(message[1:]))
+        kind = message[:1]
+        if kind != MESSAGE:
+            return kind, None, loads(message[1:]) if kind == OPEN else message[1:]
+        kind = message[:2]
+        if kind == EVENT:
+            packet = loads(_strip_ack_id(message, 2))
+            return EVENT, packet[0], packet[1] if len(packet) > 1 else None
+        if kind == BINARY_EVENT:
+            packet = loads(_strip_ack_id(message, message.index("-") + 1))
+            self.pending_event = packet[0]
+            return None
+        return kind, None, message[2:]
+
+
+def _strip_ack_id(message, start):
+    """Return the JSON part of an event, skipping an optional ack id."""
+    end = start
+    while message[end].isdigit():
+        end += 1
+    return message[end:]
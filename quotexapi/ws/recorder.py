@@ -0,0 +1,119 @@
+"""Module for recording and replaying raw Quotex websocket frames.
+
+The log is append-only: a ``QXF1`` header, then one record per frame made
+of a little-endian header (receive time as a double, payload length as an
+unsigned int, 1 for a binary frame else 0) and the raw payload.
+"""
+import mmap
+import os
+import struct
+import threading
+import time
+
+_MAGIC = b"QXF1"
+_RECORD = struct.Struct("<dIB")
+
+
+class FrameRecorder(object):
+    """Class for appending inbound websocket frames to a log file."""
+
+    def __init__(self, path):
+        """
+        :param str path: The log file, created or appended to.
+        """
+        self.path = path
+        self.frames = 0
+        self._lock = threading.Lock()
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if new:
+            self._file.write(_MAGIC)
+
+    def write(self, message, timestamp=None):
+        """Append one frame, ``str`` for text frames and ``bytes`` for binary ones."""
+        binary = not isinstance(message, str)
+        payload = bytes(message) if binary else message.encode("utf-8")
+        record = _RECORD.pack(timestamp if timestamp is not None else time.time(),
+                              len(payload), binary)
+        with self._lock:
+            self._file.write(record + payload)
+            self.frames += 1
+
+    def flush(self):
+        """Flush the buffered frames to the file."""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """Flush and close the log."""
+        with self._lock:
+            self._file.close()
+
+
+class FrameReplayer(object):
+    """Class for reading a frame log through a memory map."""
+
+    def __init__(self, path):
+        """
+        :param str path: The log written by :class:`FrameRecorder`.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError("%s is not a frame log" % path)
+
+    def __iter__(self):
+        """Yield (receive time, message) of every complete frame."""
+        data = self._map
+        offset = len(_MAGIC)
+        end = len(data)
+        while offset + _RECORD.size <= end:
+            timestamp, length, binary = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + length > end:
+                # the recorder was killed in the middle of a frame
+                return
+            payload = data[offset:offset + length]
+            offset += length
+            yield timestamp, payload if binary else payload.decode("utf-8")
+
+    def replay(self, client, speed=None):
+        """Feed every frame to ``client.on_message``.
+
+        :param client: The instance of :class:`WebsocketClient
+            <quotexapi.ws.client.WebsocketClient>` of a :class:`QuotexAPI
+            <quotexapi.api.QuotexAPI>` that was never connected, so the
+            recorded open packets and pings send nothing, or any object
+            with an ``on_message(wss, message)`` method.
+        :param float speed: 1 replays in real time, 10 ten times faster,
+            None as fast as possible.
+        :returns: Dict with frames, seconds and frames_per_sec.
+        """
+        frames = 0
+        started = time.perf_counter()
+        first = None
+        for timestamp, message in self:
+            if speed:
+                if first is None:
+                    first = timestamp
+                delay = (timestamp - first) / speed - (time.perf_counter() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            client.on_message(None, message)
+            frames += 1
+        elapsed = time.perf_counter() - started
+        return {"frames": frames, "seconds": elapsed,
+                "frames_per_sec": frames / elapsed if elapsed else 0.0}
+
+    def close(self):
+        """Unmap and close the log."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
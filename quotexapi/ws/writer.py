@@ -0,0 +1,130 @@
+"""Module for Quotex websocket writer."""
+import logging
+import queue
+import threading
+import time
+
+import websocket
+
+
+class SendHandle(object):
+    """Class returned for every queued websocket request."""
+
+    def __init__(self, data):
+        """
+        :param str data: The websocket request data.
+        """
+        self.data = data
+        self.queued_at = time.time()
+        self.sent_at = None
+        # time.perf_counter() stamps for latency measurements
+        self.created = time.perf_counter()
+        self.enqueued = None
+        self.written = None
+        self.error = None
+        self._event = threading.Event()
+
+    @property
+    def done(self):
+        """Property to check if the request left the writer.
+
+        :returns: True once the request was written or failed.
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the request was written or failed.
+
+        :param float timeout: Seconds to wait, None waits forever.
+        :returns: True if the request was written to the socket.
+        """
+        return self._event.wait(timeout) and self.error is None
+
+    def _resolve(self, error=None):
+        self.written = time.perf_counter()
+        self.sent_at = time.time()
+        self.error = error
+        self._event.set()
+
+
+class WebsocketWriter(object):
+    """Class for the single thread that writes to the Quotex websocket.
+
+    Callers enqueue requests and return immediately. When several requests
+    are pending they are encoded together and written with one socket call.
+    """
+
+    _stop = object()
+
+    def __init__(self, api, max_batch=64):
+        """
+        :param api: The instance of :class:`QuotexAPI
+            <quotexapi.api.QuotexAPI>`.
+        :param int max_batch: Maximum number of frames written in one call.
+        """
+        self.api = api
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="quotex-writer")
+        self._thread.daemon = True
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the writer thread after pending requests were written."""
+        self._queue.put(self._stop)
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def send(self, data):
+        """Queue a request for the websocket.
+
+        :param str data: The websocket request data.
+        :returns: The instance of :class:`SendHandle`.
+        """
+        handle = SendHandle(data)
+        # stamped first, the writer thread may write it before put returns
+        handle.enqueued = time.perf_counter()
+        self._queue.put(handle)
+        return handle
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is self._stop for item in batch)
+            self._write([item for item in batch if item is not self._stop])
+            if stop:
+                return
+
+    def _write(self, batch):
+        if not batch:
+            return
+        logger = logging.getLogger(__name__)
+        try:
+            if len(batch) == 1:
+                self.api.websocket.send(batch[0].data)
+            else:
+                self._write_coalesced(batch)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("websocket write failed: %s", error)
+            for handle in batch:
+                handle._resolve(error)  # pylint: disable=protected-access
+            return
+        for handle in batch:
+            logger.debug(handle.data)
+            handle._resolve()  # pylint: disable=protected-access
+
+    def _write_coalesced(self, batch):
+        sock = self.api.websocket.sock
+        frames = b"".join(
+            websocket.ABNF.create_frame(handle.data, websocket.ABNF.OPCODE_TEXT).format()
+            for handle in batch)
+        with sock.lock:
+            sock.sock.sendall(frames)